@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Indexes the approvals returned by the legal department.
+
+Every dated submission folder ('YYYY-MM-DD') may contain the returned
+spreadsheet ('Copy of Taxonomies List YYYYMMDD DAG.xlsx') and the reply
+mail ('EMAIL YYYYMMDD.txt'). The returns of all folders are parsed as
+streams and stored in a SQLite database with one row per family and
+version, so the approval status of a form is a single indexed lookup.
+
+A later cycle overrides an earlier one. Within a cycle a status in the
+spreadsheet wins over a family named in the mail, which wins over a
+blanket 'All are approved' of the mail. A blanket approval only applies
+to the forms of the taxonomies list submitted in the same cycle. Negated
+replies like 'not approved yet' are never taken as approval, they are
+reported for review instead.
+"""
+
+import datetime
+import os
+import re
+import sqlite3
+import zipfile
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from TaxonomiesList import get_taxonomies_list_name, iterate_sheet_rows, read_taxonomies_list
+
+DATED_FOLDER: re.Pattern = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+FILE_NAME_DATE: re.Pattern = re.compile(r"(\d{4})(\d{2})(\d{2})")
+BLANKET_APPROVAL: re.Pattern = re.compile(r"\ball\b.*\bapproved\b", re.IGNORECASE)
+# words turning a reply into one that has to be reviewed by hand
+NEGATION: re.Pattern = re.compile(r"\b(not|never|except|excluding|but|yet|pending|still|unless|until|cannot)\b|n't\b", re.IGNORECASE)
+
+# precedence of the sources within one cycle
+RANK_MAIL_BLANKET: int = 0
+RANK_MAIL_FAMILY: int = 1
+RANK_SPREADSHEET: int = 2
+
+# headers of the returned spreadsheet, compared in lower case
+FAMILY_HEADERS: Tuple[str, ...] = ("family", "taxonomy", "taxonomy family", "name")
+VERSION_HEADERS: Tuple[str, ...] = ("version",)
+
+class Approval(NamedTuple):
+    """Approval status of a taxonomy version: 'approved' or 'rejected'"""
+    status: str
+    date: str
+    source: str
+
+def parse_status(text: str) -> Optional[str]:
+    """
+    Return 'approved', 'rejected' or None for the status text of a return.
+    Negated text like 'not approved' or 'approved except ...' is None.
+    """
+    text = text.strip().lower()
+    if text in ("no", "n"):
+        return "rejected"
+    if text in ("yes", "y", "ok", "x", "✓", "✔"):
+        return "approved"
+    if NEGATION.search(text):
+        return None
+    if "reject" in text:
+        return "rejected"
+    if "approv" in text:
+        return "approved"
+    return None
+
+def parse_date(text: str, default: str) -> str:
+    """
+    Return a date of a return in ISO 8601 format. Excel stores dates as
+    serial number of days, other text is kept as it is.
+
+    Keyword arguments:
+    text    -- date cell of the spreadsheet
+    default -- date if the cell is empty
+    """
+    text = text.strip()
+    if not text:
+        return default
+    if re.fullmatch(r"\d+(\.\d+)?", text) and 20000 < float(text) < 80000:
+        return (datetime.date(1899, 12, 30) + datetime.timedelta(days=int(float(text)))).isoformat()
+    return text
+
+def get_file_name_date(file_name: str, default: str) -> str:
+    """Return the date of a file name like 'EMAIL 20200909.txt' in ISO 8601 format"""
+    match: Optional[re.Match] = FILE_NAME_DATE.search(file_name)
+    return f"{match.group(1)}-{match.group(2)}-{match.group(3)}" if match else default
+
+class ApprovalStore:
+    """
+    Class holds the approval status of all taxonomy versions in an
+    SQLite database. The primary key on family and version is the index
+    of every lookup.
+    """
+
+    def __init__(self, db_file: str):
+        self.db_file: str = db_file
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(db_file)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS approvals (
+                family TEXT NOT NULL COLLATE NOCASE,
+                version TEXT NOT NULL,
+                status TEXT NOT NULL,
+                approved_on TEXT NOT NULL,
+                source TEXT NOT NULL,
+                cycle TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                PRIMARY KEY (family, version)
+            );
+            CREATE TABLE IF NOT EXISTS folders (
+                path TEXT PRIMARY KEY,
+                signature TEXT NOT NULL
+            );
+        """)
+
+    def get(self, family: str, version: str) -> Optional[Approval]:
+        """
+        Return the approval of a taxonomy version or None.
+
+        Keyword arguments:
+        family  -- name of the taxonomy family, case insensitive
+        version -- version as shown in the taxonomies list
+        """
+        row: Optional[tuple] = self.connection.execute(
+            "SELECT status, approved_on, source FROM approvals WHERE family = ? AND version = ?", (family, version)
+        ).fetchone()
+        return Approval(*row) if row else None
+
+    def _store(self, family: str, version: str, status: str, date: str, source: str, cycle: str, rank: int) -> None:
+        """Insert an approval unless a later cycle or a stronger source already set it"""
+        self.connection.execute("""
+            INSERT INTO approvals (family, version, status, approved_on, source, cycle, rank) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (family, version) DO UPDATE SET
+                status = excluded.status, approved_on = excluded.approved_on, source = excluded.source,
+                cycle = excluded.cycle, rank = excluded.rank
+            WHERE (excluded.cycle, excluded.rank) >= (approvals.cycle, approvals.rank)
+        """, (family, version, status, date, source, cycle, rank))
+
+    def _ingest_spreadsheet(self, path: str, cycle: str, problems: List[str]) -> int:
+        """Store the status of every row of a returned spreadsheet, unclear ones are added to the problems"""
+        rows: Iterator[Dict[int, str]] = iterate_sheet_rows(path)
+        header: Dict[str, int] = {text.strip().lower(): index for index, text in next(rows, {}).items()}
+        family_index: Optional[int] = next((header[name] for name in FAMILY_HEADERS if name in header), None)
+        version_index: Optional[int] = next((header[name] for name in VERSION_HEADERS if name in header), None)
+        date_index: Optional[int] = next((index for name, index in header.items() if "date" in name), None)
+        status_index: Optional[int] = next((index for name, index in header.items() if ("approv" in name or "status" in name or "reject" in name) and index != date_index), None)
+        if family_index is None or status_index is None:
+            raise ValueError(f"No family or approval column in '{path}'!")
+        default_date: str = get_file_name_date(os.path.basename(path), cycle)
+        count: int = 0
+        for row_num, values in enumerate(rows, 2):
+            family: str = values.get(family_index, "").strip()
+            status_text: str = values.get(status_index, "").strip()
+            status: Optional[str] = parse_status(status_text)
+            if family and status_text and not status:
+                problems.append(f"{path}: row {row_num}: review by hand: {family} '{status_text}'")
+            if not family or not status:
+                continue
+            version: str = values.get(version_index, "").strip() if version_index is not None else ""
+            date: str = parse_date(values.get(date_index, ""), default_date) if date_index is not None else default_date
+            self._store(family, version, status, date, os.path.basename(path), cycle, RANK_SPREADSHEET)
+            count += 1
+        return count
+
+    def _ingest_mail(self, path: str, cycle: str, submitted: List[Tuple[str, str]], known: List[Tuple[str, str]], problems: List[str]) -> int:
+        """
+        Store the approvals of a reply mail. A blanket approval applies to
+        the forms submitted in its cycle, a named family also to the forms
+        known from earlier cycles. Lines that mention an approval but can
+        not be taken as one are added to the problems, the families they
+        name are left out of a blanket approval.
+
+        Keyword arguments:
+        path      -- path of the mail
+        cycle     -- dated folder of the mail
+        submitted -- family and version of the forms of the cycle's taxonomies list
+        known     -- family and version of the forms known from earlier cycles
+        problems  -- list collecting the lines to review
+        """
+        date: str = get_file_name_date(os.path.basename(path), cycle)
+        count: int = 0
+        families: List[Tuple[str, str]] = submitted or known
+        blanket_approval: bool = False
+        # forms named in a rejection or in an unclear line, e.g. 'bdp is not approved yet'
+        excluded: Set[Tuple[str, str]] = set()
+        with open(path, "r", encoding="utf-8", errors="replace") as mail_file:
+            for line_num, line in enumerate(mail_file, 1):
+                if not re.search(r"approv|reject", line, re.IGNORECASE):
+                    continue
+                status: Optional[str] = parse_status(line)
+                named: List[Tuple[str, str]] = [
+                    (family, version) for family, version in families
+                    if re.search(r"(?<![\w-])" + re.escape(family) + r"(?![\w-])", line, re.IGNORECASE)
+                ]
+                if status != "approved":
+                    excluded.update(named)
+                if not status:
+                    problems.append(f"{path}:{line_num}: review by hand: {line.strip()}")
+                    continue
+                for family, version in named:
+                    self._store(family, version, status, date, os.path.basename(path), cycle, RANK_MAIL_FAMILY)
+                    count += 1
+                if named or status != "approved" or not BLANKET_APPROVAL.search(line):
+                    continue
+                if not submitted:
+                    problems.append(f"{path}:{line_num}: blanket approval without a taxonomies list of the cycle: {line.strip()}")
+                    continue
+                blanket_approval = True
+        # applied after all lines are read, a negative may follow the blanket approval
+        if blanket_approval:
+            for family, version in submitted:
+                if (family, version) not in excluded:
+                    self._store(family, version, "approved", date, os.path.basename(path), cycle, RANK_MAIL_BLANKET)
+                    count += 1
+        return count
+
+    def ingest(self, root: str) -> Tuple[int, int, List[str]]:
+        """
+        Parse the returns of all dated folders below a root folder and
+        return the number of parsed folders, stored approvals and the
+        problems found. Folders whose files are unchanged since the last
+        ingestion are skipped.
+
+        Keyword arguments:
+        root -- folder containing the dated submission folders
+        """
+        folders: List[str] = sorted(entry.name for entry in os.scandir(root) if entry.is_dir() and DATED_FOLDER.match(entry.name))
+        parsed: int = 0
+        stored: int = 0
+        problems: List[str] = []
+        with self.connection:
+            for cycle in folders:
+                folder: str = os.path.join(root, cycle)
+                files: List[os.DirEntry] = sorted((entry for entry in os.scandir(folder) if entry.is_file()), key=lambda entry: entry.name)
+                signature: str = "|".join(f"{entry.name}:{entry.stat().st_mtime_ns}:{entry.stat().st_size}" for entry in files)
+                indexed: Optional[tuple] = self.connection.execute("SELECT signature FROM folders WHERE path = ?", (os.path.abspath(folder),)).fetchone()
+                if indexed and indexed[0] == signature:
+                    continue
+                parsed += 1
+
+                # forms submitted in this cycle, the subject of the reply mail
+                submitted: List[Tuple[str, str]] = []
+                list_name: str = get_taxonomies_list_name(cycle.replace("-", ""))
+                for entry in files:
+                    if entry.name == list_name or (entry.name.startswith("Taxonomies List ") and entry.name.endswith(".xlsx") and not submitted):
+                        try:
+                            submitted = [(record.family, record.version) for record in read_taxonomies_list(entry.path)]
+                        except (OSError, KeyError, ValueError, SyntaxError, zipfile.BadZipFile) as e:
+                            problems.append(f"{entry.path}: {e}")
+
+                # a late reply may name forms known from earlier cycles
+                known: List[Tuple[str, str]] = [] if submitted else self.connection.execute("SELECT family, version FROM approvals").fetchall()
+
+                for entry in files:
+                    try:
+                        if entry.name.lower().endswith(".xlsx") and ("dag" in entry.name.lower().split() or entry.name.startswith("Copy of ")):
+                            stored += self._ingest_spreadsheet(entry.path, cycle, problems)
+                        elif entry.name.upper().startswith("EMAIL") and entry.name.lower().endswith(".txt"):
+                            stored += self._ingest_mail(entry.path, cycle, submitted, known, problems)
+                    except (OSError, KeyError, ValueError, SyntaxError, zipfile.BadZipFile) as e:
+                        problems.append(f"{entry.path}: {e}")
+                self.connection.execute("INSERT OR REPLACE INTO folders (path, signature) VALUES (?, ?)", (os.path.abspath(folder), signature))
+        return parsed, stored, problems
+
+    def close(self) -> None:
+        """Close the database"""
+        self.connection.close()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from typing import Dict
+
+class BuildManifest:
+    """
+    Class records the hash of the inputs of every generated document.
+
+    A document only has to be composed again if the hash of its
+    inputs differs from the recorded one or the file is missing.
+    """
+
+    def __init__(self, manifest_file: str):
+        self.manifest_file: str = manifest_file
+        self.hashes: Dict[str, str] = {}
+        try:
+            with open(manifest_file, "r", encoding="utf-8") as data_file:
+                data = json.load(data_file)
+                if isinstance(data, dict):
+                    self.hashes = data
+        except (OSError, ValueError):
+            pass # first build or broken manifest, everything is built
+
+    def is_current(self, output_file: str, input_hash: str) -> bool:
+        """
+        Return True if the document exists and was built from the same inputs.
+
+        Keyword arguments:
+        output_file -- path to the generated document
+        input_hash  -- hash of all inputs of the document
+        """
+        return self.hashes.get(output_file) == input_hash and os.path.isfile(output_file)
+
+    def record(self, output_file: str, input_hash: str) -> None:
+        """Remember the inputs of a freshly generated document"""
+        self.hashes[output_file] = input_hash
+
+    def save(self) -> None:
+        """Write the manifest file"""
+        os.makedirs(os.path.dirname(self.manifest_file) or ".", exist_ok=True)
+        with open(self.manifest_file, "w", encoding="utf-8") as data_file:
+            json.dump(self.hashes, data_file, indent=2, sort_keys=True)
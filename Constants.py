@@ -1,120 +1,64 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from typing import *
+import json
+from typing import List, NamedTuple
 
-class Constants:
+class Constants(NamedTuple):
     """
-    Class contains getter methods to retrieve all
-    constants for the license approval composition.
+    Class contains all constants for the license approval composition.
 
     The costants are the necessary properties text for the tables
-    in the DOCX file.
+    in the DOCX file. The record is immutable and shared by all
+    documents of a run. The text of single constants can be replaced
+    by a profile file, see load_constants().
     """
 
-    def __init__(self):
-        self.HEADER_TEXT: str = ""
-        self.TITLE_MAIN_SECTION: str = ""
-        self.SENDER_FORM: str = ""
-        self.SUBMISSION_TEXT_PROPERTY: str = ""
-        self.SUBMISSION_TEXT_NAME: str = ""
-        self.SUBMISSION_TO: str = ""
-        self.APPT_OR_REJ_TEXT: str = ""
-        self.SUBM_DATE: str = ""
-        self.DATE_APPR_TEXT: str = ""
-        self.THIRD_PARTY_NAME_PROP: str = ""
-        self.VERSION_YEAR_PROP: str = ""
-        self.UPDATE_PROP: str = ""
-        self.SOFTW_DESC_PROP: str = ""
-        self.LINK_PROPERTY_PROP: str = ""
-        self.LICENSE_PROP: str = ""
-        self.LINK_LIC_PROP: str = ""
-        self.PROD_PROP: str = ""
-        self.TIME_VER_PROP: str = ""
-
     # header section
-    def get_header_text(self) -> str:
-        self.HEADER_TEXT = "INTERNAL USE ONLY"
-        return self.HEADER_TEXT
-
-    def get_title_main_section(self) -> str:
-        self.TITLE_MAIN_SECTION = "THIRD PARTY SOFTWARE LICENSE APPROVAL FORM"    
-        return self.TITLE_MAIN_SECTION
+    header_text: str = "INTERNAL USE ONLY"
+    title_main_section: str = "THIRD PARTY SOFTWARE LICENSE APPROVAL FORM"
 
     # meta info section
-    def get_sender_form(self) -> str:
-        self.SENDER_FORM = "From: Christoph Hartleb (Dev)"
-        return self.SENDER_FORM
-
-    def get_submission_text_property(self) -> str:
-        self.SUBMISSION_TEXT_PROPERTY = "Submitted to Legal by:"
-        return self.SUBMISSION_TEXT_PROPERTY
-
-    def get_submission_text_name(self) -> str:
-        self.SUBMISSION_TEXT_NAME = "Christoph Hartleb"
-        return self.SUBMISSION_TEXT_NAME
-
-    def get_submission_to(self) -> str:
-        self.SUBMISSION_TO = "To: Lawyer"
-        return self.SUBMISSION_TO
-
-    def get_appt_or_rej_text(self) -> str:
-        self.APPT_OR_REJ_TEXT = "Approved/Rejected by Lawyer:"
-        return self.APPT_OR_REJ_TEXT
-
-    def get_sub_date(self) -> str:
-        self.SUBM_DATE = "Submission Date: "
-        return self.SUBM_DATE
-
-    def get_date_appr_text(self) -> str:
-        self.DATE_APPR_TEXT = "Date Approved:"
-        return self.DATE_APPR_TEXT
-
-    def get_date_format(self) -> str:
-        self.DATE_FORMAT = "YYYY-MM-DD"
-        return self.DATE_FORMAT
+    sender_form: str = "From: Christoph Hartleb (Dev)"
+    submission_text_property: str = "Submitted to Legal by:"
+    submission_text_name: str = "Christoph Hartleb"
+    submission_to: str = "To: Lawyer"
+    appt_or_rej_text: str = "Approved/Rejected by Lawyer:"
+    sub_date: str = "Submission Date: "
+    date_appr_text: str = "Date Approved:"
+    date_format: str = "YYYY-MM-DD"
 
     # main section
-    def get_third_party_name_prop(self) -> str:
-        self.THIRD_PARTY_NAME_PROP = "Name of third party software:"
-        return self.THIRD_PARTY_NAME_PROP
-
-    def get_version_year_prop(self) -> str:
-        self.VERSION_YEAR_PROP = "Version number or year:"
-        return self.VERSION_YEAR_PROP
-
-    def get_update_prop(self) -> str:
-        self.UPDATE_PROP = """Is this a version update of 
-previously approved software? If 
-Yes, reason for update?"""
-        return self.UPDATE_PROP
-
-    def get_softw_desc_prop(self) -> str:
-        self.SOFTW_DESC_PROP = "General description of software:"
-        return self.SOFTW_DESC_PROP
-
-    def get_link_property_prop(self) -> str:
-        self.LINK_PROPERTY_PROP = "Link to software homepage:"
-        return self.LINK_PROPERTY_PROP
-
-    def get_license_prop(self) -> str:
-        self.LICENSE_PROP = "License type (e.g. MIT, BSD, GPL)"
-        return self.LICENSE_PROP
-
-    def get_link_lic_prop(self) -> str:
-        self.LINK_LIC_PROP = "Link to website showing license:"
-        return self.LINK_LIC_PROP
-
-    def get_prod_prop(self) -> str:
-        self.PROD_PROP = """Products that will
-introduce license?"""
-        return self.PROD_PROP
-
-    def get_affected_products(self) -> str:
-        self.AFFECTED_PRODUCTS = """List of all products where the software is usesd
-"""
-        return self.AFFECTED_PRODUCTS
+    third_party_name_prop: str = "Name of third party software:"
+    version_year_prop: str = "Version number or year:"
+    # the trailing blanks of the lines are part of the form
+    update_prop: str = "Is this a version update of \npreviously approved software? If \nYes, reason for update?"
+    softw_desc_prop: str = "General description of software:"
+    link_property_prop: str = "Link to software homepage:"
+    license_prop: str = "License type (e.g. MIT, BSD, GPL)"
+    link_lic_prop: str = "Link to website showing license:"
+    prod_prop: str = "Products that will\nintroduce license?"
+    affected_products: str = "List of all products where the software is usesd\n"
+    time_ver_prop: str = "Approximate time/version?"
+
+# constants of the forms if no profile is given
+DEFAULT_CONSTANTS: Constants = Constants()
+
+def load_constants(profile_file: str) -> Constants:
+    """
+    Return the constants with the text of a profile file, e.g. for
+    another sender or legal recipient. The profile is a JSON object
+    whose keys are names of constants; missing keys keep their default.
 
-    def get_time_ver_prop(self) -> str:
-        self.TIME_VER_PROP = "Approximate time/version?"
-        return self.TIME_VER_PROP
+    Keyword arguments:
+    profile_file -- path to the JSON profile
+    """
+    with open(profile_file, "r", encoding="utf-8") as data_file:
+        data = json.load(data_file)
+    if not isinstance(data, dict):
+        raise ValueError(f"Constants profile '{profile_file}' is not a JSON object!")
+    errors: List[str] = [f"unknown constant '{key}'" for key in data if key not in Constants._fields]
+    errors += [f"'{key}' is not a string" for key, value in data.items() if key in Constants._fields and not isinstance(value, str)]
+    if errors:
+        raise ValueError(f"Constants profile '{profile_file}' is invalid:\n  " + "\n  ".join(errors))
+    return DEFAULT_CONSTANTS._replace(**data)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# data file with the properties of all taxonomy families
+FAMILY_REGISTRY_FILE: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "families.json")
+
+class Link(NamedTuple):
+    """Text of a table cell, shown as hyperlink if 'url' is set"""
+    text: str
+    url: Optional[str] = None
+
+class Comment(NamedTuple):
+    """One paragraph of the additional comments section"""
+    text: str
+    font_size: int
+    url: Optional[str] = None
+
+class FamilyData(NamedTuple):
+    """All properties of a taxonomy family used in the license approval"""
+    name: str
+    homepage: Link
+    update: str
+    license_type: Link
+    license_webpage: Link
+    license_webpage_template_key: Optional[str]
+    version_format: Optional[str]
+    additional_comments: Tuple[Comment, ...]
+
+    def format_version(self, taxonomy_version: str) -> str:
+        """
+        Return the version as shown in the document. Families with a
+        'version_format' get the space separated parts of the version
+        filled in, e.g. "2.10.1 5.0.0" -> "2.10.1 bdp v5.0.0" for 'bdp'.
+
+        Raises a ValueError if the version has too few parts for the format.
+
+        Keyword arguments:
+        taxonomy_version -- version of the taxonomy
+        """
+        if not self.version_format:
+            return taxonomy_version
+        try:
+            return self.version_format.format(*taxonomy_version.split(" "))
+        except (IndexError, KeyError) as e:
+            raise ValueError(f"Version '{taxonomy_version}' does not match the format '{self.version_format}' of family '{self.name}' (space separated parts)") from e
+
+# allowed keys of a family entry
+FAMILY_KEYS: Tuple[str, ...] = (
+    "homepage",
+    "update",
+    "license_type",
+    "license_webpage",
+    "license_webpage_template_key",
+    "version_format",
+    "additional_comments"
+)
+
+class FamilyRegistry:
+    """
+    Class holds the properties of all taxonomy families.
+
+    The registry is loaded from a JSON file with a 'default' entry and
+    one entry per family that overrides single properties. All entries
+    are validated and merged once at load time, so resolving a family
+    is a single dict lookup.
+    """
+
+    def __init__(self, registry_file: str = FAMILY_REGISTRY_FILE):
+        self.registry_file: str = registry_file
+        self.mtime_ns: int = os.stat(registry_file).st_mtime_ns
+        with open(registry_file, "r", encoding="utf-8") as data_file:
+            data: dict = json.load(data_file)
+        errors: List[str] = []
+        if not isinstance(data, dict) or not isinstance(data.get("default"), dict) or not isinstance(data.get("families"), dict):
+            raise ValueError(f"Family registry '{registry_file}' needs a 'default' and a 'families' object!")
+        self.default: FamilyData = self._compile("default", {}, data["default"], errors)
+        self.families: Dict[str, FamilyData] = {}
+        for name, entry in data["families"].items():
+            self.families[name] = self._compile(name, data["default"], entry, errors)
+        if errors:
+            raise ValueError(f"Family registry '{registry_file}' is invalid:\n  " + "\n  ".join(errors))
+
+    def _compile(self, name: str, default: dict, entry: dict, errors: List[str]) -> Optional[FamilyData]:
+        """Return the validated family data of a registry entry merged with the default entry"""
+        if not isinstance(entry, dict):
+            errors.append(f"'{name}': entry is not an object")
+            return None
+        for key in entry:
+            if key not in FAMILY_KEYS:
+                errors.append(f"'{name}': unknown key '{key}'")
+        merged: dict = {**default, **entry}
+
+        def link(key: str) -> Optional[Link]:
+            value = merged.get(key)
+            if not isinstance(value, dict) or not isinstance(value.get("text"), str) or not isinstance(value.get("url", ""), str) or set(value) - {"text", "url"}:
+                errors.append(f"'{name}': '{key}' needs a 'text' and an optional 'url' string")
+                return None
+            return Link(value["text"], value.get("url"))
+
+        def optional_str(key: str) -> Optional[str]:
+            value = merged.get(key)
+            if value is not None and not isinstance(value, str):
+                errors.append(f"'{name}': '{key}' is not a string")
+            return value
+
+        comments: List[Comment] = []
+        for comment in merged.get("additional_comments") or []:
+            if not isinstance(comment, dict) or not isinstance(comment.get("text"), str) or not isinstance(comment.get("font_size"), int) or not isinstance(comment.get("url", ""), str):
+                errors.append(f"'{name}': additional comments need a 'text', a 'font_size' and an optional 'url'")
+                continue
+            comments.append(Comment(comment["text"], comment["font_size"], comment.get("url")))
+        if not isinstance(merged.get("update"), str):
+            errors.append(f"'{name}': 'update' is not a string")
+
+        return FamilyData(
+            name,
+            link("homepage"),
+            merged.get("update"),
+            link("license_type"),
+            link("license_webpage"),
+            optional_str("license_webpage_template_key"),
+            optional_str("version_format"),
+            tuple(comments)
+        )
+
+    def get(self, taxonomy_family_name: str) -> FamilyData:
+        """
+        Return the properties of a taxonomy family. Families without
+        an entry get the properties of the default entry.
+
+        Keyword arguments:
+        taxonomy_family_name -- name of the taxonomy family. E.g.: "eba"
+        """
+        family_data: Optional[FamilyData] = self.families.get(taxonomy_family_name)
+        if family_data is None:
+            return self.default._replace(name=taxonomy_family_name)
+        return family_data
+
+    def is_stale(self) -> bool:
+        """Return True if the registry file changed since it was loaded"""
+        try:
+            return os.stat(self.registry_file).st_mtime_ns != self.mtime_ns
+        except OSError:
+            return True
+
+    def __contains__(self, taxonomy_family_name: str) -> bool:
+        return taxonomy_family_name in self.families
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Renders license approvals directly as OOXML.
+
+The engine does not build python-docx objects. All static parts of the
+document (styles, theme, header, footer, ...) and the body of the
+skeleton are taken once from the serialized skeleton. Per document only
+the main section is rendered from escaped string fragments, appended to
+the skeleton body and zipped together with the cached parts.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+import zipfile
+from io import BytesIO
+
+RT_HYPERLINK: str = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink"
+DOCUMENT_PART: str = "word/document.xml"
+DOCUMENT_RELS_PART: str = "word/_rels/document.xml.rels"
+
+# width of a cell in a table spanning the page, split in equal columns
+PAGE_WIDTH_DXA: int = 8640
+
+class StaticParts:
+    """
+    Class holds the parts of a serialized skeleton which are the same
+    for every document plus the body and relationships to extend.
+    """
+
+    __slots__ = ("parts", "body_prefix", "body_suffix", "rels_prefix", "rels_suffix", "next_rel_id", "static_zips")
+
+    def __init__(self, skeleton: bytes):
+        self.parts: List[Tuple[zipfile.ZipInfo, bytes]] = []
+        with zipfile.ZipFile(BytesIO(skeleton)) as skeleton_zip:
+            for info in skeleton_zip.infolist():
+                self.parts.append((info, skeleton_zip.read(info)))
+        parts: Dict[str, bytes] = {info.filename: data for info, data in self.parts}
+        document: str = parts[DOCUMENT_PART].decode("utf-8")
+        # the main section is inserted in front of the final section properties
+        sect_pr: int = document.rindex("<w:sectPr")
+        self.body_prefix: str = document[:sect_pr]
+        self.body_suffix: str = document[sect_pr:]
+        rels: str = parts[DOCUMENT_RELS_PART].decode("utf-8")
+        end: int = rels.rindex("</Relationships>")
+        self.rels_prefix: str = rels[:end]
+        self.rels_suffix: str = rels[end:]
+        self.next_rel_id: int = max([int(rel_id) for rel_id in re.findall(r'Id="rId(\d+)"', rels)] or [0]) + 1
+        self.static_zips: Dict[Tuple[int, Optional[int]], bytes] = {}
+
+    def get_static_zip(self, compression: int, compresslevel: Optional[int] = None) -> bytes:
+        """
+        Return a ZIP archive with all parts except document.xml and its
+        relationships, compressed only once per compression method and level.
+
+        Keyword arguments:
+        compression   -- zipfile compression of the parts
+        compresslevel -- level of the compression, None for the default
+        """
+        static_zip: Optional[bytes] = self.static_zips.get((compression, compresslevel))
+        if static_zip is None:
+            stream: BytesIO = BytesIO()
+            with zipfile.ZipFile(stream, "w", compression, compresslevel=compresslevel) as docx_zip:
+                for info, data in self.parts:
+                    if info.filename not in (DOCUMENT_PART, DOCUMENT_RELS_PART):
+                        docx_zip.writestr(info.filename, data)
+            static_zip = self.static_zips[(compression, compresslevel)] = stream.getvalue()
+        return static_zip
+
+# parsed skeletons by their skeleton key, the least recently used are dropped
+_static_parts_cache: "OrderedDict[str, StaticParts]" = OrderedDict()
+STATIC_PARTS_CACHE_SIZE: int = 32
+
+def get_static_parts(skeleton_key: str, skeleton: bytes) -> StaticParts:
+    """
+    Return the static parts of a skeleton, split only once per key.
+
+    Keyword arguments:
+    skeleton_key -- cache key of the skeleton
+    skeleton     -- serialized skeleton document
+    """
+    static_parts: Optional[StaticParts] = _static_parts_cache.get(skeleton_key)
+    if static_parts is None:
+        static_parts = _static_parts_cache[skeleton_key] = StaticParts(skeleton)
+        # the key changes with every day and approval in a long-running server
+        while len(_static_parts_cache) > STATIC_PARTS_CACHE_SIZE:
+            _static_parts_cache.popitem(last=False)
+    else:
+        _static_parts_cache.move_to_end(skeleton_key)
+    return static_parts
+
+def run_content(text: str) -> str:
+    """
+    Return the content of a w:r element for a text the same way
+    python-docx does: tabs and line breaks become w:tab and w:br,
+    text with surrounding whitespace keeps it with xml:space.
+
+    Keyword arguments:
+    text -- text of the run
+    """
+    fragments: List[str] = []
+    for part in re.split(r"(\t|\r\n|\n|\r)", text):
+        if part == "\t":
+            fragments.append("<w:tab/>")
+        elif part in ("\r\n", "\n", "\r"):
+            fragments.append("<w:br/>")
+        elif part:
+            preserve: str = ' xml:space="preserve"' if len(part.strip()) < len(part) else ""
+            fragments.append(f"<w:t{preserve}>{escape(part)}</w:t>")
+    return "".join(fragments)
+
+def text_run(text: str, rpr: str = "") -> str:
+    """
+    Return a w:r element with text and optional run properties.
+
+    Keyword arguments:
+    text -- text of the run
+    rpr  -- content of the w:rPr element
+    """
+    content: str = (f"<w:rPr>{rpr}</w:rPr>" if rpr else "") + run_content(text)
+    return f"<w:r>{content}</w:r>" if content else "<w:r/>"
+
+def hyperlink_run(relation_id: str, text: str) -> str:
+    """
+    Return the run composed by add_hyperlink(): an underlined run in
+    hyperlink color containing the w:hyperlink element.
+
+    Keyword arguments:
+    relation_id -- id of the hyperlink relationship
+    text        -- text of the embedded url
+    """
+    return (
+        '<w:r><w:rPr><w:color w:val="000000" w:themeColor="hyperlink"/><w:u w:val="single"/></w:rPr>'
+        f'<w:hyperlink r:id="{relation_id}" w:history="1"><w:r><w:rPr><w:rStyle w:val="Hyperlink"/></w:rPr>'
+        f"{run_content(text)}</w:r></w:hyperlink></w:r>"
+    )
+
+def paragraph(runs: str = "", ppr: str = "") -> str:
+    """
+    Return a w:p element.
+
+    Keyword arguments:
+    runs -- runs of the paragraph
+    ppr  -- content of the w:pPr element
+    """
+    content: str = (f"<w:pPr>{ppr}</w:pPr>" if ppr else "") + runs
+    return f"<w:p>{content}</w:p>" if content else "<w:p/>"
+
+def table(cells: List[List[str]]) -> str:
+    """
+    Return a w:tbl element as created by python-docx' add_table() with
+    equal column widths. Every cell is given as its paragraphs.
+
+    Keyword arguments:
+    cells -- paragraphs of all cells by row and column
+    """
+    cols: int = len(cells[0])
+    width: int = PAGE_WIDTH_DXA // cols
+    tc_pr: str = f'<w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>'
+    fragments: List[str] = [
+        '<w:tbl><w:tblPr><w:tblW w:type="auto" w:w="0"/>'
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+        '</w:tblPr><w:tblGrid>',
+        f'<w:gridCol w:w="{width}"/>' * cols,
+        "</w:tblGrid>"
+    ]
+    for row in cells:
+        fragments.append("<w:tr>")
+        for cell in row:
+            fragments.append(f"<w:tc>{tc_pr}{cell or paragraph()}</w:tc>")
+        fragments.append("</w:tr>")
+    fragments.append("</w:tbl>")
+    return "".join(fragments)
+
+class FastDocument:
+    """
+    Class collects the body fragments and hyperlinks of one document
+    and zips them together with the static parts of the skeleton.
+    """
+
+    __slots__ = ("static_parts", "body", "relation_ids")
+
+    def __init__(self, static_parts: StaticParts):
+        self.static_parts: StaticParts = static_parts
+        self.body: List[str] = []
+        self.relation_ids: Dict[str, str] = {}
+
+    def relate_to(self, url: str) -> str:
+        """Return the relationship id of an external hyperlink, one per url"""
+        relation_id: Optional[str] = self.relation_ids.get(url)
+        if relation_id is None:
+            relation_id = self.relation_ids[url] = f"rId{self.static_parts.next_rel_id + len(self.relation_ids)}"
+        return relation_id
+
+    def runs(self, value) -> str:
+        """
+        Return the runs of a table cell value like fill_table() adds
+        them: a text, a link with 'text' and optional 'url' or a list
+        of links. Links with an url become hyperlinks.
+
+        Keyword arguments:
+        value -- value of the table cell
+        """
+        links: list = [value] if value is None or isinstance(value, str) or hasattr(value, "url") else value
+        fragments: List[str] = []
+        for link in links:
+            if hasattr(link, "url") and link.url:
+                fragments.append(hyperlink_run(self.relate_to(link.url), link.text))
+            else:
+                fragments.append(text_run(link.text if hasattr(link, "url") else (link or "")))
+        return "".join(fragments)
+
+    def append(self, fragment: str) -> None:
+        """Append a rendered element to the body"""
+        self.body.append(fragment)
+
+    def to_bytes(self, compression: int = zipfile.ZIP_DEFLATED, compresslevel: Optional[int] = None) -> bytes:
+        """
+        Return the DOCX package of the document.
+
+        Keyword arguments:
+        compression   -- zipfile compression of the parts
+        compresslevel -- level of the compression, None for the default
+        """
+        static_parts: StaticParts = self.static_parts
+        document: bytes = (static_parts.body_prefix + "".join(self.body) + static_parts.body_suffix).encode("utf-8")
+        relationships: str = "".join(
+            f'<Relationship Id="{relation_id}" Type="{RT_HYPERLINK}" Target={quoteattr(url)} TargetMode="External"/>'
+            for url, relation_id in self.relation_ids.items()
+        )
+        rels: bytes = (static_parts.rels_prefix + relationships + static_parts.rels_suffix).encode("utf-8")
+        # the compressed static parts are copied, only the body is compressed per document
+        stream: BytesIO = BytesIO(static_parts.get_static_zip(compression, compresslevel))
+        with zipfile.ZipFile(stream, "a", compression, compresslevel=compresslevel) as docx_zip:
+            docx_zip.writestr(DOCUMENT_PART, document)
+            docx_zip.writestr(DOCUMENT_RELS_PART, rels)
+        return stream.getvalue()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+from typing import Dict, Iterator, List, Set, Tuple
+
+class FileWatcher:
+    """
+    Class polls files and directory trees for changes.
+
+    Every poll takes a snapshot of the modification time and size of
+    all watched files and reports the absolute paths of the files that
+    were created, modified or deleted since the previous snapshot. No
+    file system notification API is needed, so it works the same on
+    Windows, network drives and Linux.
+    """
+
+    def __init__(self, paths: List[str]):
+        self.paths: List[str] = [os.path.abspath(path) for path in paths]
+        self.snapshot: Dict[str, Tuple[int, int]] = self._take_snapshot()
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Return modification time and size of every watched file"""
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        for path in self.paths:
+            if os.path.isdir(path):
+                for root, _, files in os.walk(path):
+                    for name in files:
+                        self._add(snapshot, os.path.join(root, name))
+            else:
+                self._add(snapshot, path)
+        return snapshot
+
+    @staticmethod
+    def _add(snapshot: Dict[str, Tuple[int, int]], path: str) -> None:
+        try:
+            stat: os.stat_result = os.stat(path)
+        except OSError:
+            return # deleted in the meantime or not created yet
+        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+    def poll(self) -> Set[str]:
+        """Return the paths changed since the last poll"""
+        snapshot: Dict[str, Tuple[int, int]] = self._take_snapshot()
+        changed: Set[str] = {path for path in snapshot.keys() | self.snapshot.keys() if snapshot.get(path) != self.snapshot.get(path)}
+        self.snapshot = snapshot
+        return changed
+
+    def changes(self, interval: float = 1.0) -> Iterator[Set[str]]:
+        """
+        Yield the changed paths for ever. Changes are debounced: editors
+        and build tools write files in several steps, so the changes are
+        collected until the files stay unchanged for one interval and
+        then yielded together.
+
+        Keyword arguments:
+        interval -- seconds between two polls
+        """
+        while True:
+            time.sleep(interval)
+            changed: Set[str] = self.poll()
+            if not changed:
+                continue
+            while True:
+                time.sleep(interval)
+                more: Set[str] = self.poll()
+                if not more:
+                    break
+                changed |= more
+            yield changed
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compares the license approval forms of two submission cycles.
+
+A form is reduced to a canonical text: the text of every paragraph and
+table cell of its document.xml in document order, hyperlinks replaced
+by their text and target. Formatting, relationship ids and the
+submission date do not change the canonical text, so only forms with
+a different content get a different hash. The document.xml is parsed
+as a stream directly from the ZIP entry, also for forms inside a
+submission bundle.
+"""
+
+import hashlib
+import os
+import re
+import zipfile
+from typing import BinaryIO, Callable, Collection, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from xml.etree import ElementTree as ET
+
+W_NS: str = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+R_ID: str = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+DOCUMENT_PART: str = "word/document.xml"
+DOCUMENT_RELS_PART: str = "word/_rels/document.xml.rels"
+
+# date of a file name like '... Form 20200909.docx' or the placeholder of the generator
+FILE_NAME_DATE: re.Pattern = re.compile(r"\s*(\d{8}|YYYYMMDD)(?=\.docx$)", re.IGNORECASE)
+
+class FormSummary(NamedTuple):
+    """Hash of the canonical text and main table values of a form"""
+    name: str
+    digest: str
+    fields: Dict[str, str]
+
+class FormDiff(NamedTuple):
+    """Result of the comparison of one form: 'new', 'changed' or 'unchanged'"""
+    key: str
+    status: str
+    name: str
+    changed_fields: List[Tuple[str, str, str]]
+
+def normalize(text: str) -> str:
+    """Return the text with all whitespace collapsed to single blanks"""
+    return " ".join(text.split())
+
+def get_form_key(file_name: str) -> str:
+    """
+    Return the name of a form without its date, which identifies the
+    same form in different cycles.
+
+    Keyword arguments:
+    file_name -- file name of the form
+    """
+    return FILE_NAME_DATE.sub("", os.path.basename(file_name)).lower()
+
+def summarize_form(docx_file: BinaryIO, name: str, labels: Sequence[str], masked_prefixes: Sequence[str] = ()) -> FormSummary:
+    """
+    Return the summary of a form, streaming its document.xml.
+
+    Keyword arguments:
+    docx_file       -- seekable binary stream of the DOCX package
+    name            -- file name of the form
+    labels          -- labels of the main table rows whose values are compared
+    masked_prefixes -- text of cells starting with one of these prefixes is
+                       reduced to the prefix, e.g. the submission date
+    """
+    field_labels: Dict[str, str] = {normalize(label): label for label in labels}
+    prefixes: List[str] = [normalize(prefix) for prefix in masked_prefixes]
+    digest = hashlib.sha256()
+    fields: Dict[str, str] = {}
+    with zipfile.ZipFile(docx_file) as docx_zip:
+        targets: Dict[str, str] = {}
+        if DOCUMENT_RELS_PART in docx_zip.namelist():
+            for relationship in ET.fromstring(docx_zip.read(DOCUMENT_RELS_PART)):
+                targets[relationship.get("Id")] = relationship.get("Target")
+
+        paragraph: List[str] = []
+        hyperlinks: List[str] = []
+        # paragraphs of the open cells and cells of the open rows, one level per nested table
+        cells: List[List[str]] = []
+        rows: List[List[str]] = []
+        with docx_zip.open(DOCUMENT_PART) as document:
+            for event, element in ET.iterparse(document, events=("start", "end")):
+                tag: str = element.tag
+                if event == "start":
+                    if tag == W_NS + "tc":
+                        cells.append([])
+                    elif tag == W_NS + "tr":
+                        rows.append([])
+                    elif tag == W_NS + "hyperlink":
+                        hyperlinks.append(targets.get(element.get(R_ID), element.get(W_NS + "anchor") or ""))
+                    continue
+                if tag == W_NS + "t":
+                    paragraph.append(element.text or "")
+                elif tag == W_NS + "tab":
+                    paragraph.append("\t")
+                elif tag in (W_NS + "br", W_NS + "cr"):
+                    paragraph.append("\n")
+                elif tag == W_NS + "hyperlink":
+                    paragraph.append(f" <{hyperlinks.pop()}>")
+                elif tag == W_NS + "p":
+                    text: str = normalize("".join(paragraph))
+                    paragraph = []
+                    if cells:
+                        cells[-1].append(text)
+                    else:
+                        digest.update(f"p|{text}\n".encode("utf-8"))
+                    element.clear()
+                elif tag == W_NS + "tc":
+                    cell_text: str = normalize(" ".join(cells.pop()))
+                    for prefix in prefixes:
+                        if cell_text.startswith(prefix):
+                            cell_text = prefix
+                    rows[-1].append(cell_text)
+                elif tag == W_NS + "tr":
+                    row: List[str] = rows.pop()
+                    row_text: str = "|".join(row)
+                    if cells:
+                        cells[-1].append(row_text) # nested table
+                    else:
+                        digest.update(f"r|{row_text}\n".encode("utf-8"))
+                    if len(row) >= 2 and row[0] in field_labels:
+                        fields[field_labels[row[0]]] = row[1]
+                    element.clear()
+    return FormSummary(name, digest.hexdigest(), fields)
+
+def iterate_forms(location: str, names: Optional[Collection[str]] = None) -> Iterator[Tuple[str, Callable[[], BinaryIO]]]:
+    """
+    Yield file name and opener of every form in a folder or in a ZIP
+    archive like a submission bundle. Forms in an archive are opened as
+    stream of the archive entry, they are not extracted.
+
+    Keyword arguments:
+    location -- folder or ZIP archive with DOCX files
+    names    -- file names of the forms to yield (default: all)
+    """
+    if os.path.isdir(location):
+        for name in sorted(os.listdir(location) if names is None else names):
+            # a named form may be missing, e.g. an approved form of an earlier cycle
+            if name.lower().endswith(".docx") and not name.startswith("~$") and os.path.isfile(os.path.join(location, name)):
+                yield name, (lambda path=os.path.join(location, name): open(path, "rb"))
+        return
+    with zipfile.ZipFile(location) as bundle_zip:
+        for info in bundle_zip.infolist():
+            if info.filename.lower().endswith(".docx") and (names is None or os.path.basename(info.filename) in names):
+                yield os.path.basename(info.filename), (lambda info=info: bundle_zip.open(info))
+
+def summarize_forms(location: str, labels: Sequence[str], masked_prefixes: Sequence[str] = (), names: Optional[Collection[str]] = None) -> Dict[str, FormSummary]:
+    """
+    Return the summaries of the forms of a folder or archive by form key.
+
+    Keyword arguments:
+    location        -- folder or ZIP archive with DOCX files
+    labels          -- labels of the main table rows whose values are compared
+    masked_prefixes -- prefixes of cells whose remaining text is ignored
+    names           -- file names of the forms to summarize (default: all)
+    """
+    summaries: Dict[str, FormSummary] = {}
+    for name, opener in iterate_forms(location, names):
+        with opener() as docx_file:
+            summaries[get_form_key(name)] = summarize_form(docx_file, name, labels, masked_prefixes)
+    return summaries
+
+def diff_forms(previous: Dict[str, FormSummary], current: Dict[str, FormSummary]) -> List[FormDiff]:
+    """
+    Return the comparison of every current form with the form of the
+    same key in the previous cycle, ordered by key.
+
+    Keyword arguments:
+    previous -- summaries of the forms of the previous cycle
+    current  -- summaries of the current forms
+    """
+    diffs: List[FormDiff] = []
+    for key, summary in sorted(current.items()):
+        old: Optional[FormSummary] = previous.get(key)
+        if old is None:
+            diffs.append(FormDiff(key, "new", summary.name, []))
+        elif old.digest == summary.digest:
+            diffs.append(FormDiff(key, "unchanged", summary.name, []))
+        else:
+            changed_fields: List[Tuple[str, str, str]] = [
+                (label, old.fields.get(label, ""), value)
+                for label, value in summary.fields.items() if old.fields.get(label, "") != value
+            ]
+            diffs.append(FormDiff(key, "changed", summary.name, changed_fields))
+    return diffs
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Long-running generation server for license approvals.
+
+The server keeps the constants, the template catalog, the family
+registry, parsed templates and the ArtifactDatabase.xml version warm
+between requests. It listens on localhost or on a Unix socket and
+speaks plain HTTP:
+
+    GET  /health   -- state of the caches as JSON
+    POST /generate -- JSON body {"family": "eba", "version": "3.3"} plus the
+                      optional keys "template", "approximate_version",
+                      "engine" ('docx' or 'fast') and "output" ('bytes' returns
+                      the DOCX package, 'file' writes it to 'lics/')
+
+The caches are checked before every request and reloaded when the
+templates tree, the registry or the artifact database changed.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import socketserver
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+from Constants import Constants, DEFAULT_CONSTANTS, load_constants
+from FamilyRegistry import FamilyData, FamilyRegistry
+from TemplateCatalog import TemplateCatalog
+import gen_lic_approval as gla
+
+DOCX_CONTENT_TYPE: str = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+# largest accepted request body
+MAX_REQUEST_SIZE: int = 64 * 1024
+
+class GeneratorState:
+    """
+    Class holds everything that is shared by all requests and reloads
+    the parts whose files changed since they were loaded.
+    """
+
+    def __init__(self, templates_dirs: Sequence[str], registry_file: str, artifact_database: str, engine: str = "docx", constants_file: Optional[str] = None):
+        self.templates_dirs: List[str] = list(templates_dirs)
+        self.registry_file: str = registry_file
+        self.artifact_database: str = artifact_database
+        self.engine: str = engine
+        self.objConsts: Constants = load_constants(constants_file) if constants_file else DEFAULT_CONSTANTS
+        self.template_catalog: TemplateCatalog = TemplateCatalog(self.templates_dirs)
+        self.template_catalog.get_all_templates()
+        self.family_registry: FamilyRegistry = FamilyRegistry(registry_file)
+        # python-docx documents and the caches are not shared between threads
+        self.lock: threading.Lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Reload template catalog and family registry if their files changed"""
+        if self.template_catalog.is_stale():
+            self.template_catalog = TemplateCatalog(self.templates_dirs)
+            self.template_catalog.get_all_templates()
+        if self.family_registry.is_stale():
+            try:
+                self.family_registry = FamilyRegistry(self.registry_file)
+            except (OSError, ValueError) as e:
+                # keep serving with the last valid registry
+                print(f"ERROR: {e}")
+
+    def generate(self, request: dict) -> Tuple[str, bytes]:
+        """
+        Return file name and DOCX package of a generate request.
+
+        Keyword arguments:
+        request -- 'family', 'version' and optional overrides
+        """
+        with self.lock:
+            self.refresh()
+            family_data: FamilyData = self.family_registry.get(request["family"])
+            template: str = request.get("template") or self.template_catalog.find(request["family"]) or ""
+            approximate_version: Optional[str] = request.get("approximate_version") or gla.get_approximate_version(self.artifact_database)
+            docx_data: bytes = gla.render_license_approval(
+                self.objConsts,
+                family_data,
+                request["version"],
+                template,
+                approximate_version,
+                request.get("engine") or self.engine
+            )
+        return gla.get_docx_file_name(family_data.name, request["version"]), docx_data
+
+    def health(self) -> dict:
+        """Return the state of the caches"""
+        with self.lock:
+            self.refresh()
+            return {
+                "status": "ok",
+                "templates": len(self.template_catalog.get_all_templates()),
+                "families": len(self.family_registry.families),
+                "engine": self.engine
+            }
+
+class GeneratorRequestHandler(BaseHTTPRequestHandler):
+    """Class answers the HTTP requests of the generation server"""
+
+    server_version: str = "LicenseApprovalServer/1.0"
+    state: Optional[GeneratorState] = None
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def send_json(self, status: int, data: dict) -> None:
+        """Send a JSON response"""
+        body: bytes = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self.send_json(200, self.state.health())
+        else:
+            self.send_json(404, {"error": f"Unknown path '{self.path}'"})
+
+    def do_POST(self) -> None:
+        if self.path != "/generate":
+            self.send_json(404, {"error": f"Unknown path '{self.path}'"})
+            return
+        try:
+            length: int = int(self.headers.get("Content-Length", 0))
+            if length > MAX_REQUEST_SIZE:
+                raise ValueError("Request body is too large")
+            request: dict = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict) or not request.get("family") or not request.get("version"):
+                raise ValueError("Request needs a 'family' and a 'version'")
+            for key in ("family", "version", "template", "approximate_version"):
+                if key in request and not isinstance(request[key], str):
+                    raise ValueError(f"'{key}' must be a string")
+            if request.get("output", "bytes") not in ("bytes", "file"):
+                raise ValueError("'output' must be 'bytes' or 'file'")
+            if request.get("engine", "docx") not in ("docx", "fast"):
+                raise ValueError("'engine' must be 'docx' or 'fast'")
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+
+        try:
+            docx_file_name, docx_data = self.state.generate(request)
+        except ValueError as e:
+            self.send_json(422, {"error": str(e)})
+            return
+        except Exception as e:
+            self.send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        if request.get("output") == "file":
+            try:
+                with open(os.path.join("lics", docx_file_name), "wb") as docx_file:
+                    docx_file.write(docx_data)
+            except OSError as e:
+                self.send_json(500, {"error": f"Document '{docx_file_name}' could not be written: {e}"})
+                return
+            self.send_json(200, {"file": docx_file_name})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", DOCX_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(docx_data)))
+        self.send_header("Content-Disposition", f'attachment; filename="{docx_file_name}"')
+        self.end_headers()
+        self.wfile.write(docx_data)
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix socket"""
+
+    daemon_threads: bool = True
+
+def serve(state: GeneratorState, host: str = "127.0.0.1", port: int = 8765, unix_socket: Optional[str] = None) -> None:
+    """
+    Serve generate requests until the process is interrupted.
+
+    Keyword arguments:
+    state       -- shared state of all requests
+    host        -- interface of the HTTP server
+    port        -- port of the HTTP server
+    unix_socket -- path of a Unix socket used instead of host and port
+    """
+    handler: type = type("BoundGeneratorRequestHandler", (GeneratorRequestHandler,), {"state": state})
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server: socketserver.BaseServer = ThreadingUnixHTTPServer(unix_socket, handler)
+        address: str = unix_socket
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+        address = f"http://{host}:{port}"
+    print(f"Serving license approvals on {address} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if unix_socket and os.path.exists(unix_socket):
+            os.remove(unix_socket)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Stage timers, allocation counters and per-family profiles.
+
+Every stage of a build is wrapped in 'instrumentation.stage(name)'.
+The wall time of all stages is always recorded, the net allocated
+memory only while tracemalloc is tracing (see '-profile'). Stages nest,
+so the time of a stage includes the time of the stages inside it. The
+peak resident set size of the process and its workers is read from the
+operating system at the end of a run.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
+
+# prefix of the Prometheus metric names
+METRICS_PREFIX: str = "license_approval"
+# number of allocation sites in a tracemalloc report
+TRACEMALLOC_TOP: int = 25
+
+def get_tracemalloc() -> Optional[ModuleType]:
+    """
+    Return the tracemalloc module while it is tracing, otherwise None.
+    The module is only imported by '-profile', a run without it does
+    not pay for the import.
+    """
+    module: Optional[ModuleType] = sys.modules.get("tracemalloc")
+    return module if module is not None and module.is_tracing() else None
+
+def get_peak_rss(children: bool = False) -> Optional[int]:
+    """
+    Return the peak resident set size in bytes or None if the operating
+    system does not report it. The peak of the worker processes is known
+    once they have exited and is not reported on Windows.
+
+    Keyword arguments:
+    children -- peak of the largest terminated child process instead of this process
+    """
+    try:
+        import resource
+    except ImportError:
+        return None if children else get_windows_peak_rss()
+    peak: int = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, all other systems kilobytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def get_windows_peak_rss() -> Optional[int]:
+    """Return the peak working set of this process on Windows or None"""
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage"
+                )
+            ]
+
+        counters: PROCESS_MEMORY_COUNTERS = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except (AttributeError, OSError):
+        pass
+    return None
+
+class Stage:
+    """Context manager measuring one execution of a stage"""
+
+    __slots__ = ("record", "start", "memory")
+
+    def __init__(self, record: List[float]):
+        self.record: List[float] = record
+
+    def __enter__(self) -> "Stage":
+        tracing: Optional[ModuleType] = get_tracemalloc()
+        self.memory: Optional[int] = tracing.get_traced_memory()[0] if tracing else None
+        self.start: float = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        record: List[float] = self.record
+        record[0] += 1
+        record[1] += time.perf_counter() - self.start
+        if self.memory is not None:
+            tracing: Optional[ModuleType] = get_tracemalloc()
+            if tracing:
+                record[2] += tracing.get_traced_memory()[0] - self.memory
+
+class Instrumentation:
+    """
+    Class accumulates calls, seconds and allocated bytes per stage
+    plus counters of a run.
+    """
+
+    def __init__(self):
+        # stage name -> [calls, seconds, allocated bytes]
+        self.stages: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.start: float = time.perf_counter()
+
+    def stage(self, name: str) -> Stage:
+        """
+        Return a context manager adding the execution of a stage.
+
+        Keyword arguments:
+        name -- name of the stage. E.g.: "save"
+        """
+        record: Optional[List[float]] = self.stages.get(name)
+        if record is None:
+            record = self.stages[name] = [0, 0.0, 0]
+        return Stage(record)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increase a counter of the run"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, stages: Dict[str, List[float]]) -> None:
+        """Add the stages measured in another process"""
+        for name, (calls, seconds, allocated) in stages.items():
+            record: List[float] = self.stages.setdefault(name, [0, 0.0, 0])
+            record[0] += calls
+            record[1] += seconds
+            record[2] += allocated
+
+    def summary(self) -> dict:
+        """Return all stages and counters as JSON serializable summary"""
+        tracing: Optional[ModuleType] = get_tracemalloc()
+        summary: dict = {
+            "run_seconds": round(time.perf_counter() - self.start, 6),
+            "allocations_traced": tracing is not None,
+            "counters": dict(sorted(self.counters.items())),
+            "stages": {
+                name: {
+                    "calls": int(calls),
+                    "seconds": round(seconds, 6),
+                    "mean_ms": round(seconds * 1000 / calls, 3) if calls else 0.0,
+                    "allocated_bytes": int(allocated)
+                }
+                for name, (calls, seconds, allocated) in sorted(self.stages.items())
+            }
+        }
+        if tracing:
+            summary["peak_traced_bytes"] = tracing.get_traced_memory()[1]
+        summary["peak_rss_bytes"] = get_peak_rss()
+        summary["workers_peak_rss_bytes"] = get_peak_rss(children=True)
+        return summary
+
+    def to_prometheus(self) -> str:
+        """Return the summary in the Prometheus text exposition format"""
+        summary: dict = self.summary()
+        lines: List[str] = [
+            f"# HELP {METRICS_PREFIX}_stage_seconds_total Wall time of a build stage including nested stages.",
+            f"# TYPE {METRICS_PREFIX}_stage_seconds_total counter"
+        ]
+        lines += [f'{METRICS_PREFIX}_stage_seconds_total{{stage="{name}"}} {stage["seconds"]}' for name, stage in summary["stages"].items()]
+        lines += [
+            f"# HELP {METRICS_PREFIX}_stage_calls_total Executions of a build stage.",
+            f"# TYPE {METRICS_PREFIX}_stage_calls_total counter"
+        ]
+        lines += [f'{METRICS_PREFIX}_stage_calls_total{{stage="{name}"}} {stage["calls"]}' for name, stage in summary["stages"].items()]
+        if summary["allocations_traced"]:
+            lines += [
+                f"# HELP {METRICS_PREFIX}_stage_allocated_bytes_total Net memory allocated by a build stage.",
+                f"# TYPE {METRICS_PREFIX}_stage_allocated_bytes_total counter"
+            ]
+            lines += [f'{METRICS_PREFIX}_stage_allocated_bytes_total{{stage="{name}"}} {stage["allocated_bytes"]}' for name, stage in summary["stages"].items()]
+        lines += [
+            f"# HELP {METRICS_PREFIX}_documents Documents of the run by result.",
+            f"# TYPE {METRICS_PREFIX}_documents gauge"
+        ]
+        lines += [f'{METRICS_PREFIX}_documents{{result="{name}"}} {value}' for name, value in summary["counters"].items()]
+        peaks: List[Tuple[str, Optional[int]]] = [("main", summary["peak_rss_bytes"]), ("workers", summary["workers_peak_rss_bytes"])]
+        if any(peak for _, peak in peaks):
+            lines += [
+                f"# HELP {METRICS_PREFIX}_peak_rss_bytes Peak resident set size of the main process and the largest worker.",
+                f"# TYPE {METRICS_PREFIX}_peak_rss_bytes gauge"
+            ]
+            lines += [f'{METRICS_PREFIX}_peak_rss_bytes{{process="{name}"}} {peak}' for name, peak in peaks if peak]
+        lines += [
+            f"# HELP {METRICS_PREFIX}_run_seconds Wall time of the run.",
+            f"# TYPE {METRICS_PREFIX}_run_seconds gauge",
+            f"{METRICS_PREFIX}_run_seconds {summary['run_seconds']}"
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """
+        Write the summary, as Prometheus textfile if the path ends with
+        '.prom' and as JSON otherwise. The file is replaced atomically,
+        so a collector never reads a partial file.
+
+        Keyword arguments:
+        path -- path of the metrics file
+        """
+        data: str = self.to_prometheus() if path.endswith(".prom") else json.dumps(self.summary(), indent=2)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8", newline="\n") as metrics_file:
+            metrics_file.write(data)
+        os.replace(path + ".tmp", path)
+
+# instrumentation of the current process
+instrumentation: Instrumentation = Instrumentation()
+
+class InstrumentedEntry:
+    """
+    Class wraps a function generating one manifest entry, e.g.
+    generate_entry(). The call returns the result of the function and
+    the stages measured during the call, so measurements taken in
+    worker processes reach the main process. With a profile folder
+    every entry writes a cProfile file and a tracemalloc report.
+    """
+
+    def __init__(self, function: Callable, profile_dir: Optional[str] = None):
+        self.function: Callable = function
+        self.profile_dir: Optional[str] = profile_dir
+
+    def __call__(self, entry: dict, *args) -> Tuple[tuple, Dict[str, List[float]]]:
+        outer_stages: Dict[str, List[float]] = instrumentation.stages
+        instrumentation.stages = {}
+        try:
+            if not self.profile_dir:
+                return self.function(entry, *args), instrumentation.stages
+            import cProfile
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            profile_name: str = re.sub(r"[^\w.-]+", "_", f"{entry['family']}-{entry['version']}")
+            snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+            profiler: cProfile.Profile = cProfile.Profile()
+            result: tuple = profiler.runcall(self.function, entry, *args)
+            allocations: List[tracemalloc.StatisticDiff] = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+            profiler.dump_stats(os.path.join(self.profile_dir, profile_name + ".prof"))
+            with open(os.path.join(self.profile_dir, profile_name + ".tracemalloc.txt"), "w", encoding="utf-8") as report_file:
+                report_file.write(f"Top {TRACEMALLOC_TOP} allocation sites of '{entry['family']}' version '{entry['version']}'\n")
+                for statistic in allocations[:TRACEMALLOC_TOP]:
+                    report_file.write(f"{statistic}\n")
+            return result, instrumentation.stages
+        finally:
+            instrumentation.stages = outer_stages
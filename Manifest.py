@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import os
+from typing import Dict, Iterable, Iterator, List
+
+# columns every manifest entry has to provide, all others are overrides
+REQUIRED_KEYS: tuple = ("family", "version")
+
+def read_manifest(manifest_file: str) -> List[Dict[str, str]]:
+    """
+    Return all entries of a batch manifest as a list of dicts.
+    See iterate_manifest().
+
+    Keyword arguments:
+    manifest_file -- path to the manifest
+    """
+    return list(iterate_manifest(manifest_file))
+
+def iterate_manifest(manifest_file: str) -> Iterator[Dict[str, str]]:
+    """
+    Yield the entries of a batch manifest one by one as dicts, so a batch
+    of any size is not held in memory. CSV and JSONL manifests are read
+    line by line, a JSON manifest is one document and parsed at once.
+    The format is chosen by the file extension:
+
+        .csv   -- header row 'family,version[,override,...]'
+        .json  -- list of objects
+        .jsonl -- one object per line
+
+    Keys beside 'family' and 'version' are kept as overrides. An invalid
+    entry raises a ValueError when it is reached.
+
+    Keyword arguments:
+    manifest_file -- path to the manifest
+    """
+    extension: str = os.path.splitext(manifest_file)[1].lower()
+    if extension not in (".csv", ".json", ".jsonl"):
+        raise ValueError(f"Manifest '{manifest_file}' must be a CSV, JSON or JSONL file!")
+    with open(manifest_file, "r", encoding="utf-8", newline="") as data_file:
+        entries: Iterable
+        if extension == ".csv":
+            entries = (dict(row) for row in csv.DictReader(data_file))
+        elif extension == ".json":
+            entries = json.load(data_file)
+            if not isinstance(entries, list):
+                raise ValueError(f"Manifest '{manifest_file}' must contain a list of entries!")
+        else:
+            entries = (json.loads(line) for line in data_file if line.strip())
+
+        for line_num, entry in enumerate(entries, 1):
+            if not isinstance(entry, dict):
+                raise ValueError(f"Entry {line_num} in manifest '{manifest_file}' is not an object!")
+            for key in REQUIRED_KEYS:
+                if not entry.get(key):
+                    raise ValueError(f"Entry {line_num} in manifest '{manifest_file}' has no '{key}'!")
+            # empty CSV cells are no overrides
+            for key in [key for key, value in entry.items() if value in ("", None)]:
+                del entry[key]
+            yield entry
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Writes and reads the 'Taxonomies List YYYYMMDD.xlsx' of a submission.
+
+The workbook is written directly as SpreadsheetML: the worksheet is
+streamed row by row into the archive, so no spreadsheet library and no
+object model of the sheet is needed. Entries that are new or changed
+compared to the list of the previous cycle are marked yellow.
+"""
+
+import fnmatch
+import glob
+import os
+import re
+import zipfile
+from io import BytesIO
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape
+
+SPREADSHEET_NS: str = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIPS_NS: str = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_RELATIONSHIPS_NS: str = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# header of the list and width of its columns in characters
+COLUMNS: Tuple[str, ...] = ("Family", "Version", "Update", "Homepage", "License type", "License link")
+COLUMN_WIDTHS: Tuple[int, ...] = (18, 18, 40, 50, 30, 60)
+
+# cell styles of styles.xml
+STYLE_HEADER: int = 1
+STYLE_MARKED: int = 2
+
+class TaxonomyRecord(NamedTuple):
+    """One row of the taxonomies list"""
+    family: str
+    version: str
+    update: str
+    homepage: str
+    license_type: str
+    license_link: str
+
+    def key(self) -> Tuple[str, str]:
+        """Return family and version, which identify a row"""
+        return (self.family.lower(), self.version)
+
+STATIC_PARTS: Dict[str, str] = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<Relationships xmlns="{PACKAGE_RELATIONSHIPS_NS}">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<workbook xmlns="{SPREADSHEET_NS}" xmlns:r="{RELATIONSHIPS_NS}">'
+        '<sheets><sheet name="Taxonomies" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<Relationships xmlns="{PACKAGE_RELATIONSHIPS_NS}">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    # cell styles: 0 default, 1 bold header, 2 yellow marked entry
+    "xl/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<styleSheet xmlns="{SPREADSHEET_NS}">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="3"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill>'
+        '<fill><patternFill patternType="solid"><fgColor rgb="FFFFFF00"/><bgColor indexed="64"/></patternFill></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+        '<xf numFmtId="0" fontId="0" fillId="2" borderId="0" xfId="0" applyFill="1"/></cellXfs>'
+        '</styleSheet>'
+    )
+}
+
+def get_taxonomies_list_name(date_text: str) -> str:
+    """
+    Return the file name of the list of a submission.
+
+    Keyword arguments:
+    date_text -- submission date as YYYYMMDD
+    """
+    return f"Taxonomies List {date_text}.xlsx"
+
+def find_previous_taxonomies_list(folder: str, current_name: str) -> Optional[str]:
+    """
+    Return the most recent list in a folder or in one of its submission
+    bundles other than the current one. The date in the file name sorts
+    the lists. A list in a bundle is returned as path of the archive
+    followed by the entry name, e.g. 'lics/2020-09-09.zip/2020-09-09/Taxonomies List 20200909.xlsx'.
+
+    Keyword arguments:
+    folder       -- folder with the lists and bundles of previous submissions
+    current_name -- file name of the list written now
+    """
+    pattern: str = get_taxonomies_list_name("*")
+    candidates: List[Tuple[str, str]] = [(os.path.basename(path), path) for path in glob.glob(os.path.join(folder, pattern))]
+    for bundle in glob.glob(os.path.join(folder, "*.zip")):
+        try:
+            with zipfile.ZipFile(bundle) as bundle_zip:
+                names: List[str] = bundle_zip.namelist()
+        except (OSError, zipfile.BadZipFile):
+            # e.g. the bundle written right now
+            continue
+        candidates.extend((name.rsplit("/", 1)[-1], f"{bundle}/{name}") for name in names if fnmatch.fnmatch(name.rsplit("/", 1)[-1], pattern))
+    candidates = sorted(candidate for candidate in candidates if candidate[0] != current_name)
+    return candidates[-1][1] if candidates else None
+
+def open_workbook(path: str) -> BinaryIO:
+    """
+    Return a binary stream of a workbook file or of a workbook in a ZIP
+    archive like a submission bundle, see find_previous_taxonomies_list().
+
+    Keyword arguments:
+    path -- path to the workbook, optionally inside an archive
+    """
+    match: Optional[re.Match] = None if os.path.isfile(path) else re.match(r"(.+?\.zip)[/\\](.+)$", path, re.IGNORECASE)
+    if match is None or not os.path.isfile(match.group(1)):
+        return open(path, "rb")
+    with zipfile.ZipFile(match.group(1)) as bundle_zip:
+        return BytesIO(bundle_zip.read(match.group(2).replace("\\", "/")))
+
+def column_name(index: int) -> str:
+    """Return the column letters of a zero based column index"""
+    name: str = ""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        name = chr(ord("A") + rest) + name
+    return name
+
+def column_index(cell_reference: str) -> int:
+    """Return the zero based column index of a cell reference like 'AB12'"""
+    index: int = 0
+    for letter in re.match(r"[A-Z]*", cell_reference.upper()).group(0):
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+def render_row(row_num: int, values: Iterable[str], style: int = 0) -> str:
+    """
+    Return a row element with inline string cells.
+
+    Keyword arguments:
+    row_num -- one based number of the row
+    values  -- text of the cells
+    style   -- index of the cell style, 0 for the default
+    """
+    style_attribute: str = f' s="{style}"' if style else ""
+    cells: List[str] = [
+        f'<c r="{column_name(i)}{row_num}" t="inlineStr"{style_attribute}><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+        for i, value in enumerate(values)
+    ]
+    return f'<row r="{row_num}">{"".join(cells)}</row>'
+
+def write_taxonomies_list(file: Union[str, BinaryIO], rows: Iterable[Tuple[TaxonomyRecord, bool]]) -> None:
+    """
+    Write the list as workbook. The rows are streamed into the worksheet
+    one by one.
+
+    Keyword arguments:
+    file -- path or binary stream of the workbook
+    rows -- records and whether they are marked yellow
+    """
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as xlsx_zip:
+        for name, data in STATIC_PARTS.items():
+            xlsx_zip.writestr(name, data)
+        with xlsx_zip.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            cols: str = "".join(f'<col min="{i}" max="{i}" width="{width}" customWidth="1"/>' for i, width in enumerate(COLUMN_WIDTHS, 1))
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<worksheet xmlns="{SPREADSHEET_NS}"><cols>{cols}</cols><sheetData>'
+                + render_row(1, COLUMNS, STYLE_HEADER)
+            ).encode("utf-8"))
+            for row_num, (record, marked) in enumerate(rows, 2):
+                sheet.write(render_row(row_num, record, STYLE_MARKED if marked else 0).encode("utf-8"))
+            sheet.write(b"</sheetData></worksheet>")
+
+def iterate_sheet_rows(path: str) -> Iterator[Dict[int, str]]:
+    """
+    Yield the cell values of every row of the first worksheet by zero
+    based column index. The worksheet is parsed as a stream. Works with
+    workbooks written by this module as well as with workbooks saved by
+    Excel.
+
+    Keyword arguments:
+    path -- path to the workbook, optionally inside an archive
+    """
+    ns: Dict[str, str] = {"s": SPREADSHEET_NS, "r": RELATIONSHIPS_NS, "p": PACKAGE_RELATIONSHIPS_NS}
+    with open_workbook(path) as xlsx_file, zipfile.ZipFile(xlsx_file) as xlsx_zip:
+        shared_strings: List[str] = []
+        if "xl/sharedStrings.xml" in xlsx_zip.namelist():
+            for item in ET.fromstring(xlsx_zip.read("xl/sharedStrings.xml")).findall("s:si", ns):
+                shared_strings.append("".join(text.text or "" for text in item.iter(f"{{{SPREADSHEET_NS}}}t")))
+        # first worksheet of the workbook
+        sheet: Optional[ET.Element] = ET.fromstring(xlsx_zip.read("xl/workbook.xml")).find("s:sheets/s:sheet", ns)
+        rels: ET.Element = ET.fromstring(xlsx_zip.read("xl/_rels/workbook.xml.rels"))
+        targets: Dict[str, str] = {rel.get("Id"): rel.get("Target") for rel in rels.findall("p:Relationship", ns)}
+        target: Optional[str] = targets.get(sheet.get(f"{{{RELATIONSHIPS_NS}}}id")) if sheet is not None else None
+        if not target:
+            raise ValueError(f"No worksheet in '{path}'!")
+        sheet_name: str = target.lstrip("/") if target.startswith("/") else "xl/" + target
+
+        with xlsx_zip.open(sheet_name) as sheet_file:
+            for _, element in ET.iterparse(sheet_file):
+                if element.tag != f"{{{SPREADSHEET_NS}}}row":
+                    continue
+                values: Dict[int, str] = {}
+                for position, cell in enumerate(element.findall("s:c", ns)):
+                    cell_type: Optional[str] = cell.get("t")
+                    if cell_type == "inlineStr":
+                        text: str = "".join(t.text or "" for t in cell.iter(f"{{{SPREADSHEET_NS}}}t"))
+                    else:
+                        value: Optional[ET.Element] = cell.find("s:v", ns)
+                        text = value.text or "" if value is not None else ""
+                        if cell_type == "s" and text:
+                            text = shared_strings[int(text)]
+                    # the reference is optional, cells without one follow each other
+                    values[column_index(cell.get("r")) if cell.get("r") else position] = text
+                element.clear()
+                yield values
+
+def read_taxonomies_list(path: str) -> List[TaxonomyRecord]:
+    """
+    Return the records of the first worksheet of a list. The columns are
+    matched by their header, other columns are ignored and rows without
+    family are skipped.
+
+    Keyword arguments:
+    path -- path to the workbook, optionally inside an archive
+    """
+    rows: Iterator[Dict[int, str]] = iterate_sheet_rows(path)
+    header: Dict[str, int] = {text.strip().lower(): index for index, text in next(rows, {}).items()}
+    indices: List[Optional[int]] = [header.get(column.lower()) for column in COLUMNS]
+    if header and indices[0] is None:
+        raise ValueError(f"No '{COLUMNS[0]}' column in '{path}'!")
+    records: List[TaxonomyRecord] = []
+    for values in rows:
+        record: TaxonomyRecord = TaxonomyRecord(*[values.get(index, "").strip() if index is not None else "" for index in indices])
+        if record.family:
+            records.append(record)
+    return records
+
+def merge_taxonomies_list(previous: List[TaxonomyRecord], records: Iterable[TaxonomyRecord]) -> List[Tuple[TaxonomyRecord, bool]]:
+    """
+    Return the rows of the new list: the entries of the previous list in
+    their order, then the new entries. Entries of this batch which are
+    new or differ from the previous list are marked.
+
+    Keyword arguments:
+    previous -- records of the list of the previous cycle
+    records  -- records of the current batch
+    """
+    rows: Dict[Tuple[str, str], Tuple[TaxonomyRecord, bool]] = {record.key(): (record, False) for record in previous}
+    for record in records:
+        known: Optional[Tuple[TaxonomyRecord, bool]] = rows.get(record.key())
+        if known is None or known[0] != record:
+            rows[record.key()] = (record, True)
+    return list(rows.values())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from functools import lru_cache
+import json
+import os
+from typing import Dict, Optional
+
+class LicenseSection:
+    """
+    Class holds the 'license' map of a taxonomy template.
+
+    The keys used in the license approval are available as
+    attributes, all keys of the map can be retrieved with get().
+    """
+
+    __slots__ = ("swname", "swdescription", "licweb1", "values")
+
+    def __init__(self, values: Dict[str, str]):
+        self.swname: Optional[str] = values.get("swname")
+        self.swdescription: Optional[str] = values.get("swdescription")
+        self.licweb1: Optional[str] = values.get("licweb1")
+        self.values: Dict[str, str] = values
+
+    def get(self, elem_name: str) -> Optional[str]:
+        """Return the value of a key in the 'license' map or None"""
+        return self.values.get(elem_name)
+
+    def __contains__(self, elem_name: str) -> bool:
+        return elem_name in self.values
+
+class Template:
+    """Class holds a parsed taxonomy template and its 'license' map"""
+
+    __slots__ = ("path", "data", "license")
+
+    def __init__(self, path: str, data: dict):
+        self.path: str = path
+        self.data: dict = data
+        license_data = data.get("license") if isinstance(data, dict) else None
+        self.license: Optional[LicenseSection] = LicenseSection(license_data) if isinstance(license_data, dict) else None
+
+@lru_cache(maxsize=256)
+def _parse_template(path: str, mtime_ns: int, size: int) -> Template:
+    """Return the parsed template. Modification time and size are part of the cache key."""
+    with open(path, "r", encoding="utf-8") as data_file:
+        return Template(path, json.load(data_file))
+
+def load_template(path: str) -> Template:
+    """
+    Return the parsed template file. Every template is parsed only
+    once as long as its modification time and size are unchanged.
+
+    Keyword arguments:
+    path -- path to the template
+    """
+    stat: os.stat_result = os.stat(path)
+    return _parse_template(path, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import bisect
+import os
+from contextlib import closing
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# relative location of the taxonomy templates (formerly "..\\..\\templates")
+TEMPLATES_DIR: str = os.path.join("..", "..", "templates")
+# roots of the templates trees, $TEMPLATES_DIRS separated by os.pathsep
+TEMPLATES_DIRS: List[str] = [path for path in os.environ.get("TEMPLATES_DIRS", "").split(os.pathsep) if path] or [TEMPLATES_DIR]
+# threads scanning the subtrees of the templates trees
+DISCOVERY_JOBS: int = min(8, (os.cpu_count() or 1) * 2)
+
+def is_family_directory(directory_name: str, key: str) -> bool:
+    """
+    Return True if a directory may contain the template of a family,
+    e.g. 'boe' for the family 'boe-insurance' or 'eba-3.3' for 'eba'.
+
+    Keyword arguments:
+    directory_name -- name of the directory
+    key            -- lower case name of the taxonomy family
+    """
+    directory_name = directory_name.lower()
+    return key.startswith(directory_name) or directory_name.startswith(key)
+
+def get_scan_order(roots: Sequence[str], directory: str) -> Tuple[int, List[str]]:
+    """
+    Return the sort key of a directory that orders the directories like
+    a top-down walk of the roots in their order.
+
+    Keyword arguments:
+    roots     -- roots of the templates trees
+    directory -- directory below one of the roots
+    """
+    root_index: int = next((i for i, root in enumerate(roots) if os.path.join(directory, "").startswith(os.path.join(root, ""))), len(roots))
+    return root_index, directory.split(os.sep)
+
+def scan_directory(directory: str, key: Optional[str]) -> Tuple[str, Optional[List[str]], List[str]]:
+    """
+    Return the directory, its files and its subdirectories to descend
+    into. With a family only files and directories of the family are
+    returned. The files are None if the directory can not be read.
+
+    Keyword arguments:
+    directory -- directory to scan
+    key       -- lower case name of the taxonomy family or None for all
+    """
+    files: List[str] = []
+    subdirectories: List[str] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if key is None or is_family_directory(entry.name, key):
+                        subdirectories.append(entry.path)
+                elif key is None or entry.name.lower().startswith(key):
+                    files.append(entry.path)
+    except OSError:
+        return directory, None, [] # skipped like os.walk() does
+    return directory, files, subdirectories
+
+def walk_templates(roots: Sequence[str], taxonomy_family_name: Optional[str] = None, jobs: int = DISCOVERY_JOBS) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Yield every directory of the templates trees with its files as soon
+    as it is scanned. The roots are scanned first, then the subtrees
+    below them concurrently, so the order of the directories is not
+    defined. With a family the directories and files not belonging to
+    it are pruned. Closing the generator stops the scan.
+
+    Keyword arguments:
+    roots                -- roots of the templates trees
+    taxonomy_family_name -- name of the taxonomy family or None for all templates
+    jobs                 -- number of threads scanning subtrees
+    """
+    # the thread pool is imported on the first scan, not with every start
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from queue import SimpleQueue
+
+    key: Optional[str] = taxonomy_family_name.lower() if taxonomy_family_name else None
+    # the subtrees report every directory and their end to a queue
+    scanned: SimpleQueue = SimpleQueue()
+    stopped: threading.Event = threading.Event()
+
+    def walk_subtree(subtree: str) -> None:
+        try:
+            directories: List[str] = [subtree]
+            while directories and not stopped.is_set():
+                directory, files, subdirectories = scan_directory(directories.pop(), key)
+                directories.extend(subdirectories)
+                if files is not None:
+                    scanned.put((directory, files))
+            scanned.put(None)
+        except BaseException as e:
+            scanned.put(e)
+
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max(1, jobs))
+    try:
+        subtrees: int = 0
+        for root in roots:
+            directory, files, subdirectories = scan_directory(root, key)
+            for subdirectory in subdirectories:
+                executor.submit(walk_subtree, subdirectory)
+            subtrees += len(subdirectories)
+            if files is not None:
+                yield directory, files
+        while subtrees:
+            result: Union[Tuple[str, List[str]], BaseException, None] = scanned.get()
+            if result is None:
+                subtrees -= 1
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                yield result
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def discover_templates(roots: Sequence[str], taxonomy_family_name: Optional[str] = None, jobs: int = DISCOVERY_JOBS) -> Iterator[str]:
+    """
+    Yield the template files of the templates trees lazily, see
+    walk_templates().
+
+    Keyword arguments:
+    roots                -- roots of the templates trees
+    taxonomy_family_name -- name of the taxonomy family or None for all templates
+    jobs                 -- number of threads scanning directories
+    """
+    with closing(walk_templates(roots, taxonomy_family_name, jobs)) as directories:
+        for _, files in directories:
+            yield from files
+
+def find_template(taxonomy_family_name: str, roots: Sequence[str] = TEMPLATES_DIRS, jobs: int = DISCOVERY_JOBS) -> Optional[str]:
+    """
+    Return the template path of a single taxonomy family without
+    indexing the whole templates trees, or None. Only directories named
+    like the family are scanned, so only a file named exactly like the
+    family is returned. Of several such files the first one of
+    TemplateCatalog.find() wins. A prefix match may lie in any other
+    directory, for it the caller falls back to TemplateCatalog.find().
+
+    Keyword arguments:
+    taxonomy_family_name -- name of the taxonomy family. E.g.: "eba"
+    roots                -- roots of the templates trees
+    jobs                 -- number of threads scanning directories
+    """
+    key: str = taxonomy_family_name.lower()
+    matches: List[Tuple[Tuple[int, List[str]], str]] = []
+    with closing(walk_templates(roots, taxonomy_family_name, jobs)) as directories:
+        for directory, files in directories:
+            matches.extend((get_scan_order(roots, directory), path) for path in files if os.path.splitext(os.path.basename(path))[0].lower() == key)
+    # the scan order is not defined, the matches are sorted like the catalog sorts its templates
+    return min(matches)[1] if matches else None
+
+class TemplateCatalog:
+    """
+    Class indexes all template files of the templates trees
+    with one concurrent scan of their directories.
+
+    The template files are mapped by their lower case file name
+    (without extension) so that a taxonomy family name can be
+    resolved by an exact or prefix match without walking the
+    tree again.
+    """
+
+    def __init__(self, roots: Union[str, Sequence[str]] = TEMPLATES_DIRS, jobs: int = DISCOVERY_JOBS):
+        self.roots: List[str] = [roots] if isinstance(roots, str) else list(roots)
+        self.jobs: int = jobs
+        self.templates: List[str] = []
+        self.names: List[str] = []
+        self.paths_by_name: Dict[str, List[str]] = {}
+        self.directory_mtimes: Dict[str, int] = {}
+        self._indexed: bool = False
+
+    def _index(self) -> None:
+        """Scan the templates trees once and build the name -> path map"""
+        # the scan order is not defined, the templates are sorted like a top-down walk of the roots in their order
+        directories: List[Tuple[Tuple[int, List[str]], List[str]]] = []
+        for directory, files in walk_templates(self.roots, jobs=self.jobs):
+            try:
+                self.directory_mtimes[directory] = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue # removed during the scan
+            directories.append((get_scan_order(self.roots, directory), sorted(files)))
+        directories.sort(key=lambda directory: directory[0])
+        self.templates = [path for _, files in directories for path in files]
+        for path in self.templates:
+            self.paths_by_name.setdefault(os.path.splitext(os.path.basename(path))[0].lower(), []).append(path)
+        self.names = sorted(self.paths_by_name)
+        self._indexed = True
+
+    def is_stale(self) -> bool:
+        """
+        Return True if a template was added, removed or renamed since the
+        tree was indexed. Only the indexed directories are checked, a new
+        file or folder changes the modification time of its parent.
+        """
+        if not self._indexed:
+            return False
+        for directory, mtime_ns in self.directory_mtimes.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        # a missing root may have been created in the meantime
+        return any(root not in self.directory_mtimes and os.path.isdir(root) for root in self.roots)
+
+    def get_all_templates(self) -> List[str]:
+        """Return a list with all template files plus the relative path"""
+        if not self._indexed:
+            self._index()
+        return self.templates
+
+    def find(self, taxonomy_family_name: str) -> Optional[str]:
+        """
+        Return the template path of a taxonomy family or None.
+
+        An exact match of the file name wins. Otherwise the shortest
+        file name starting with the family name is taken, e.g. the
+        family 'eba' resolves to 'eba-3.3.json' rather than to
+        'eba-3.3-phase2.json'.
+
+        Keyword arguments:
+        taxonomy_family_name -- name of the taxonomy family. E.g.: "eba"
+        """
+        if not self._indexed:
+            self._index()
+        key: str = taxonomy_family_name.lower()
+        if key in self.paths_by_name:
+            return self.paths_by_name[key][0]
+        # names are sorted, therefore all prefix matches are adjacent
+        start: int = bisect.bisect_left(self.names, key)
+        candidates: List[str] = []
+        for name in self.names[start:]:
+            if not name.startswith(key):
+                break
+            candidates.append(name)
+        if not candidates:
+            return None
+        best: str = min(candidates, key=lambda name: (len(name), name))
+        return self.paths_by_name[best][0]
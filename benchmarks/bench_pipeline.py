@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmarks the document generation pipeline of gen_lic_approval.py.
+
+The benchmark creates reproducible synthetic fixtures in a temporary
+folder: a templates tree, a large ArtifactDatabase.xml and manifests
+with 1, 50 and 500 families. It times the template discovery, the
+ArtifactDatabase.xml lookup, every build step of a document, saving
+the document and whole batches. The results are printed as JSON and
+can be written to a file to compare runs.
+
+Usage: py -3.10 benchmarks/bench_pipeline.py [-repeat=20] [-sizes=1,50,500] [-output=bench.json]
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+from typing import Callable, Dict, List, Optional
+
+REPO_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import gen_lic_approval as gla
+from Constants import Constants, DEFAULT_CONSTANTS
+from FamilyRegistry import FamilyRegistry
+from TemplateCatalog import TemplateCatalog, find_template
+
+# number of families in the synthetic templates tree
+TEMPLATE_FAMILIES: int = 500
+# number of artifacts in front of the version element of the synthetic database
+ARTIFACTS: int = 200000
+
+def create_templates(templates_dir: str, family_names: List[str]) -> None:
+    """
+    Create one template per family in its own folder plus an unrelated
+    file, similar to the layout of the real templates tree.
+
+    Keyword arguments:
+    templates_dir -- root of the templates tree
+    family_names  -- names of the taxonomy families
+    """
+    for family_name in family_names:
+        family_dir: str = os.path.join(templates_dir, family_name)
+        os.makedirs(family_dir, exist_ok=True)
+        with open(os.path.join(family_dir, family_name + ".json"), "w", encoding="utf-8") as data_file:
+            json.dump({"license": {"swname": family_name, "swdescription": "synthetic taxonomy", "licweb1": f"https://www.example.com/{family_name}/license"}}, data_file)
+        with open(os.path.join(family_dir, "README.txt"), "w", encoding="utf-8") as data_file:
+            data_file.write(family_name)
+
+def create_artifact_database(path: str, artifacts: int) -> None:
+    """
+    Create an artifact database whose version element follows a large
+    number of artifacts, so the lookup has to read most of the file.
+
+    Keyword arguments:
+    path      -- path of the 'ArtifactDatabase.xml'
+    artifacts -- number of artifacts before the version element
+    """
+    with open(path, "w", encoding="utf-8") as xml_file:
+        xml_file.write('<?xml version="1.0" encoding="utf-8"?>\n<ArtifactDatabase>\n')
+        for i in range(artifacts):
+            xml_file.write(f'  <Artifact Id="artifact-{i}" Path="bin/artifact-{i}.dll"><File Name="artifact-{i}.dll" Size="{i * 7}"/></Artifact>\n')
+        xml_file.write('  <ProductVersion MajorVersionYear="2025" Minor="1"/>\n</ArtifactDatabase>\n')
+
+def create_manifest(path: str, family_names: List[str], size: int) -> None:
+    """
+    Create a CSV manifest with 'size' entries. Every entry has its own
+    version, so the entries of a family write different forms.
+
+    Keyword arguments:
+    path         -- path of the manifest
+    family_names -- names of the taxonomy families
+    size         -- number of entries
+    """
+    with open(path, "w", encoding="utf-8", newline="") as data_file:
+        writer = csv.writer(data_file)
+        writer.writerow(["family", "version"])
+        for i in range(size):
+            family_name: str = family_names[i % len(family_names)]
+            writer.writerow([family_name, "2.10.1 5.1" if family_name == "bdp" and i < len(family_names) else f"{i}.0"])
+
+def measure(stage: Callable, repeat: int, setup: Optional[Callable] = None) -> Dict[str, float]:
+    """
+    Return min, median and mean of the stage in milliseconds. Only the
+    stage is timed, the optional setup provides its arguments.
+
+    Keyword arguments:
+    stage  -- function to time
+    repeat -- number of measurements
+    setup  -- function returning the arguments of the stage
+    """
+    times_ms: List[float] = []
+    for _ in range(repeat):
+        stage_args: tuple = setup() if setup else ()
+        start: float = time.perf_counter()
+        stage(*stage_args)
+        times_ms.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeat": repeat,
+        "min_ms": round(min(times_ms), 3),
+        "median_ms": round(statistics.median(times_ms), 3),
+        "mean_ms": round(statistics.mean(times_ms), 3)
+    }
+
+def main() -> None:
+    """entry point"""
+    argp: argparse.ArgumentParser = argparse.ArgumentParser(description='Benchmark the document generation pipeline.')
+    argp.add_argument('-repeat', '--repeat', type=int, default=20, help='Number of measurements per stage')
+    argp.add_argument('-sizes', '--sizes', default="1,50,500", help='Comma separated manifest sizes of the batch benchmarks')
+    argp.add_argument('-output', '--output', help='Write the JSON results to this file')
+    argp.add_argument('-keep', '--keep', action='store_true', help='Keep the folder with the fixtures')
+    args: argparse.Namespace = argp.parse_args()
+    sizes: List[int] = [int(size) for size in args.sizes.split(",") if size]
+
+    work_dir: str = tempfile.mkdtemp(prefix="bench_lic_")
+    cwd: str = os.getcwd()
+    try:
+        # fixtures
+        family_registry: FamilyRegistry = FamilyRegistry()
+        family_names: List[str] = sorted(family_registry.families)
+        family_names += [f"synthetic-{i:04d}" for i in range(TEMPLATE_FAMILIES - len(family_names))]
+        templates_dir: str = os.path.join(work_dir, "templates")
+        artifact_database: str = os.path.join(work_dir, "ArtifactDatabase.xml")
+        cache_file: str = os.path.join(work_dir, "cache", "artifact_versions.json")
+        create_templates(templates_dir, family_names)
+        create_artifact_database(artifact_database, ARTIFACTS)
+        manifests: Dict[int, str] = {}
+        for size in sizes:
+            manifests[size] = os.path.join(work_dir, f"manifest_{size}.csv")
+            create_manifest(manifests[size], family_names, size)
+        os.makedirs(os.path.join(work_dir, "lics"))
+        os.chdir(work_dir)
+
+        objConsts: Constants = DEFAULT_CONSTANTS
+        family_data = family_registry.get("us-gaap")
+        template: str = TemplateCatalog(templates_dir).find("us-gaap")
+        submission_date: str = datetime.datetime.now().strftime("%Y-%m-%d")
+        results: Dict[str, dict] = {}
+
+        # template discovery: one cold catalog resolving every family
+        def discover() -> None:
+            catalog: TemplateCatalog = TemplateCatalog(templates_dir)
+            for family_name in family_names:
+                catalog.find(family_name)
+        results["template_discovery"] = measure(discover, args.repeat)
+        # template discovery of a single family, pruned to its directories
+        results["template_discovery_single"] = measure(lambda: find_template("us-gaap", [templates_dir]), args.repeat)
+
+        # ArtifactDatabase.xml lookup without and with cache
+        def cold_version_setup() -> tuple:
+            gla._version_cache.clear()
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+            return (artifact_database, cache_file)
+        results["approximate_version_cold"] = measure(gla.get_approximate_version, max(1, args.repeat // 4), cold_version_setup)
+        results["approximate_version_warm"] = measure(lambda: gla.get_approximate_version(artifact_database, cache_file), args.repeat)
+
+        # build steps of a single document
+        gla.new_document() # import python-docx before the first measurement
+        results["new_document"] = measure(gla.new_document, args.repeat)
+        results["header_section"] = measure(gla.set_header_section, args.repeat, lambda: (gla.new_document(), objConsts))
+        results["meta_section"] = measure(gla.set_meta_section, args.repeat, lambda: (gla.new_document(), objConsts, submission_date))
+        results["footer_section"] = measure(gla.set_footer_section, args.repeat, lambda: (gla.new_document(),))
+        results["skeleton_copy"] = measure(gla.get_skeleton, args.repeat, lambda: (objConsts,))
+        results["main_section"] = measure(gla.set_main_section, args.repeat, lambda: (gla.get_skeleton(objConsts), objConsts, family_data, "2024", template, "2025"))
+        results["add_hyperlink"] = measure(gla.add_hyperlink, args.repeat, lambda: (gla.new_document().add_paragraph(), "https://www.example.com", "example"))
+        results["additional_comments"] = measure(gla.set_additional_comments_section, args.repeat, lambda: (gla.get_skeleton(objConsts), family_data))
+        composed = lambda: (gla.compose_license_approval(objConsts, family_data, "2024", template, "2025"),)
+        results["save_bytesio"] = measure(lambda doc: doc.save(BytesIO()), args.repeat, composed)
+        results["save_file"] = measure(lambda doc: doc.save(os.path.join("lics", "bench.docx")), args.repeat, composed)
+
+        # whole batches through the serial pipeline
+        template_catalog: TemplateCatalog = TemplateCatalog(templates_dir)
+        for size in sizes:
+            entries: List[dict] = gla.read_manifest(manifests[size])
+            def batch() -> None:
+                for entry in entries:
+                    docx_file_name, error = gla.generate_entry(objConsts, entry, family_registry.get(entry["family"]), template_catalog.find(entry["family"]) or "", "2025")
+                    if error:
+                        raise RuntimeError(error)
+            batch_result: Dict[str, float] = measure(batch, 1 if size > 50 else 3)
+            batch_result["per_document_ms"] = round(batch_result["median_ms"] / size, 3)
+            results[f"batch_{size}"] = batch_result
+
+        report: dict = {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fixtures": {"template_families": len(family_names), "artifacts": ARTIFACTS, "manifest_sizes": sizes},
+            "results": results
+        }
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f"Fixtures kept in '{work_dir}'", file=sys.stderr)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as data_file:
+            json.dump(report, data_file, indent=2)
+
+if __name__ == "__main__":
+    main()
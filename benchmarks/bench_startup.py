@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Measures the cold-start latency of gen_lic_approval.py.
+
+Every run starts a fresh interpreter with '-X importtime', reads the
+cumulative import time of 'gen_lic_approval' from its report and
+measures the wall clock time of 'gen_lic_approval.py --help'. The
+median of all runs is printed as JSON.
+
+Usage: py -3.10 benchmarks/bench_startup.py [-runs=10] [-max-import-ms=100]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+REPO_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT: str = os.path.join(REPO_DIR, "gen_lic_approval.py")
+
+def measure_import_time_us(module_name: str) -> int:
+    """
+    Return the cumulative import time of a module in microseconds
+    as reported by '-X importtime' of a fresh interpreter.
+
+    Keyword arguments:
+    module_name -- name of the module to import
+    """
+    result: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    )
+    # "import time: self [us] | cumulative | imported package"
+    match = re.search(r"^import time:\s*\d+\s*\|\s*(\d+)\s*\|\s?" + re.escape(module_name) + r"\s*$", result.stderr, re.MULTILINE)
+    if not match:
+        raise RuntimeError(f"No import time of '{module_name}' reported!")
+    return int(match.group(1))
+
+def measure_help_time_ms() -> float:
+    """Return the wall clock time of 'gen_lic_approval.py --help' in milliseconds"""
+    start: float = time.perf_counter()
+    subprocess.run([sys.executable, SCRIPT, "--help"], cwd=REPO_DIR, capture_output=True, check=True)
+    return (time.perf_counter() - start) * 1000
+
+def main() -> None:
+    """entry point"""
+    argp: argparse.ArgumentParser = argparse.ArgumentParser(description='Measure the cold-start latency of gen_lic_approval.py.')
+    argp.add_argument('-runs', '--runs', type=int, default=10, help='Number of fresh interpreters per measurement')
+    argp.add_argument('-max-import-ms', '--max-import-ms', type=float, help='Fail if the median import time exceeds this budget')
+    args: argparse.Namespace = argp.parse_args()
+
+    import_times_ms: List[float] = [measure_import_time_us("gen_lic_approval") / 1000 for _ in range(args.runs)]
+    help_times_ms: List[float] = [measure_help_time_ms() for _ in range(args.runs)]
+    results: Dict[str, float] = {
+        "runs": args.runs,
+        "import_ms_median": round(statistics.median(import_times_ms), 2),
+        "import_ms_min": round(min(import_times_ms), 2),
+        "help_ms_median": round(statistics.median(help_times_ms), 2),
+        "help_ms_min": round(min(help_times_ms), 2)
+    }
+    print(json.dumps(results, indent=2))
+    if args.max_import_ms is not None and results["import_ms_median"] > args.max_import_ms:
+        print(f"ERROR: Median import time {results['import_ms_median']} ms exceeds the budget of {args.max_import_ms} ms!", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -10,36 +10,175 @@ should be submitted to the companys'
 laywer David Gast every half a year.
 """
 
+from __future__               import annotations
 import argparse
 import datetime
-from docx                     import Document
-from docx.enum.dml            import MSO_THEME_COLOR_INDEX
-from docx.enum.text           import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
-from docx.opc.constants       import RELATIONSHIP_TYPE as RT
-from docx.oxml.shared         import OxmlElement, qn, CT_String
-from docx.oxml.text.font      import CT_RPr
-from docx.oxml.text.run       import CT_R
-from docx.parts.document      import DocumentPart
-from docx.shared              import Inches, Pt, RGBColor
-from docx.styles.style        import _ParagraphStyle
-from docx.table               import _Cell
-from docx.text.run            import Run
-from docx.text.paragraph      import Paragraph
-from docx.text.parfmt         import ParagraphFormat
 import json
-from lxml.etree               import _Element
 # from msilib                   import Table
 import os
-from typing                   import MutableMapping, Tuple
+import sys
+from functools                import partial
+import hashlib
+import itertools
+from collections              import OrderedDict
+from io                       import BytesIO
+from weakref                  import WeakKeyDictionary
+from typing                   import TYPE_CHECKING, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 # from winreg                   import EnumValue
-import xml.etree.ElementTree  as ET
-from colorama                 import init
-from termcolor                import colored
-from Constants                import Constants
+from Constants                import Constants, DEFAULT_CONSTANTS, load_constants
+from TemplateCatalog          import TemplateCatalog, TEMPLATES_DIRS, find_template
+from Manifest                 import iterate_manifest, read_manifest
+from Template                 import LicenseSection, load_template
+from BuildManifest            import BuildManifest
+from FamilyRegistry           import Comment, FamilyData, FamilyRegistry, FAMILY_REGISTRY_FILE, Link
+from Instrumentation          import instrumentation
+
+# value of a table cell, see fill_table()
+CellValue = Union[str, Link, Sequence[Link], None]
+# zipfile compression method and level of the DOCX packages
+Compression = Tuple[int, Optional[int]]
+
+class ResolvedEntry(NamedTuple):
+    """Manifest entry with its resolved inputs on the way through build_entries()"""
+    entry: dict
+    family_data: FamilyData
+    template: str
+    approximate_version: str
+    approval: Optional[Approval]
+    input_hash: str
+    # 'pending', 'up_to_date', 'approved' or 'failed'
+    status: str
+    # reason of a failed entry
+    error: str
+    # result of a worker process rendering the document
+    future: Optional[Future]
+
+# python-docx, lxml, FastEngine, colorama and termcolor are imported where
+# a document is composed or a result is printed, so '--help', argument
+# errors and checks that build no document start fast.
+if TYPE_CHECKING:
+    from docx.document            import Document
+    from docx.oxml.text.run       import CT_R
+    from docx.parts.document      import DocumentPart
+    from docx.section             import _Header
+    from docx.styles.style        import _ParagraphStyle
+    from docx.table               import _Cell
+    from docx.text.run            import Run
+    from docx.text.paragraph      import Paragraph
+    from docx.text.parfmt         import ParagraphFormat
+    from lxml.etree               import _Element
+    from TaxonomiesList           import TaxonomyRecord
+    from ApprovalStore            import Approval, ApprovalStore
+    import zipfile
+    from concurrent.futures       import Executor, Future
 
 # Usage: py -3.10 gen_lic_approval.py [-family='eba'] [-version="3.2"]
 #        py -3.10 gen_lic_approval.py [-family="lei"] [-version="2022-07-02 (REC)"]
 #        py -3.10 gen_lic_approval.py [-family="bdp"] [-version="2.10.1 5.1"]
+#        py -3.10 gen_lic_approval.py [-family="eba"] [-templates="../../templates"] [-templates="../../more-templates"]
+#        py -3.10 gen_lic_approval.py [-manifest="taxonomies.csv"] [-jobs=4]
+#        py -3.10 gen_lic_approval.py [-manifest="taxonomies.csv"] [-jobs=4] [-queue-size=8] [-max-rss=500]
+#        py -3.10 gen_lic_approval.py [-manifest="taxonomies.csv"] -watch
+#        py -3.10 gen_lic_approval.py [-manifest="taxonomies.csv"] -bundle [-compression="deflate:9"]
+#        py -3.10 gen_lic_approval.py [-manifest="taxonomies.csv"] -taxonomies-list [-previous-list="Taxonomies List 20200909.xlsx"]
+#        py -3.10 gen_lic_approval.py [-manifest="taxonomies.csv"] -metrics="metrics.json" -metrics="metrics.prom" [-profile="profiles"]
+#        py -3.10 gen_lic_approval.py [-manifest="taxonomies.csv"] -check
+#        py -3.10 gen_lic_approval.py [-manifest="taxonomies.csv"] -diff="2020-09-09"
+#        py -3.10 gen_lic_approval.py -ingest-approvals="." [-manifest="taxonomies.csv"] [-include-approved]
+#        py -3.10 gen_lic_approval.py -serve [-port=8765] [-socket="/tmp/lic.sock"]
+
+ARTIFACT_DATABASE: str = os.environ.get("ARTIFACT_DATABASE", 'C:/Projects/installer/ArtifactDatabase.xml')
+# folder for caches that survive a single run
+CACHE_DIR: str = ".cache"
+VERSION_CACHE_FILE: str = os.path.join(CACHE_DIR, "artifact_versions.json")
+BUILD_MANIFEST_FILE: str = os.path.join(CACHE_DIR, "build_manifest.json")
+# index of the approvals returned by the legal department, see ApprovalStore
+APPROVALS_DB: str = os.path.join(CACHE_DIR, "approvals.sqlite3")
+# compression methods of the ZIP format, as zipfile.ZIP_STORED and zipfile.ZIP_DEFLATED;
+# zipfile itself is imported where a package or bundle is written
+ZIP_STORED: int = 0
+ZIP_DEFLATED: int = 8
+# python-docx saves its packages deflated with the default level
+DEFAULT_COMPRESSION: Compression = (ZIP_DEFLATED, None)
+# bump whenever generate_license_approval() composes documents differently
+GENERATOR_VERSION: str = "3"
+# artifact database versions by absolute path
+_version_cache: Dict[str, dict] = {}
+
+# bump whenever the layout composed in build_skeleton() changes
+SKELETON_LAYOUT_VERSION: str = "1"
+# serialized document skeletons by get_skeleton_key(), the least recently used are dropped
+_skeleton_cache: OrderedDict[str, bytes] = OrderedDict()
+SKELETON_CACHE_SIZE: int = 32
+# relationship ids of hyperlinks by document part and url
+_hyperlink_relation_ids: WeakKeyDictionary = WeakKeyDictionary()
+# element copied for every hyperlink, see get_hyperlink_prototype()
+_hyperlink_prototype: Optional[CT_R] = None
+
+def get_hyperlink_relation_id(part: DocumentPart, url: str) -> str:
+    """
+    Returns the relationship id of an external hyperlink. Every url
+    is related only once per part, later links to the same url reuse
+    the id without searching all relationships of the part again.
+
+    Keyword arguments:
+    part -- part of the document containing the hyperlink
+    url  -- website
+    """
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
+    relation_ids: Optional[Dict[str, str]] = _hyperlink_relation_ids.get(part)
+    if relation_ids is None:
+        relation_ids = _hyperlink_relation_ids[part] = {}
+    relation_id: Optional[str] = relation_ids.get(url)
+    if relation_id is None:
+        relation_id = relation_ids[url] = part.relate_to(url, RT.HYPERLINK, is_external=True)
+    return relation_id
+
+def get_hyperlink_prototype() -> CT_R:
+    """
+    Returns the prototype of a hyperlink run: an underlined run in
+    hyperlink color containing the w:hyperlink element with a run in
+    'Hyperlink' style. The prototype is parsed only once.
+    """
+    global _hyperlink_prototype
+    if _hyperlink_prototype is None:
+        from docx.oxml.ns import nsdecls
+        from docx.oxml.parser import parse_xml
+
+        _hyperlink_prototype = parse_xml(
+            f'<w:r {nsdecls("w", "r")}><w:rPr><w:color w:val="000000" w:themeColor="hyperlink"/><w:u w:val="single"/></w:rPr>'
+            '<w:hyperlink r:id="" w:history="1"><w:r><w:rPr><w:rStyle w:val="Hyperlink"/></w:rPr></w:r></w:hyperlink></w:r>'
+        )
+    return _hyperlink_prototype
+
+def add_hyperlinks(paragraph: Paragraph, links: Sequence[Tuple[str, str]]) -> List[Run]:
+    """
+    Returns the runs of embedded hyperlinks appended to a paragraph.
+    Every run is a copy of the hyperlink prototype, so no element is
+    constructed per link.
+
+    Keyword arguments:
+    paragraph -- paragraph where the links are shown
+    links     -- url and text of every link
+    """
+    from copy import deepcopy
+    from docx.oxml.shared import qn
+    from docx.text.run import Run
+
+    part: DocumentPart = paragraph.part # get access to document.xml.rels file and new relation id value
+    prototype: CT_R = get_hyperlink_prototype()
+    runs: List[Run] = []
+    with instrumentation.stage("add_hyperlink"):
+        for url, text in links:
+            new_run: CT_R = deepcopy(prototype)
+            hyperlink: _Element = new_run[1]
+            hyperlink.set(qn('r:id'), get_hyperlink_relation_id(part, url))
+            # add required text to the w:r element of the w:hyperlink
+            hyperlink[0].text = text
+            paragraph._p.append(new_run)
+            runs.append(Run(new_run, paragraph))
+    return runs
 
 def add_hyperlink(paragraph: Paragraph, url: str, text: str) -> Run:
     """
@@ -52,101 +191,130 @@ def add_hyperlink(paragraph: Paragraph, url: str, text: str) -> Run:
     url       -- website
     text      -- text for embedded url
     """
-    part: DocumentPart = paragraph.part # get access to document.xml.rels file and new relation id value
-    relation_id: str = part.relate_to(url, RT.HYPERLINK, is_external=True)
-    hyperlink: _Element = OxmlElement('w:hyperlink') # create w:hyperlink tag and add new value
-    hyperlink.set(qn('r:id'), relation_id)
-    hyperlink.set(qn('w:history'), '1')
-    new_run: CT_R = OxmlElement('w:r')
-
-    rPr: CT_RPr = OxmlElement('w:rPr') # create w:rPr element
-    rStyle: CT_String = OxmlElement('w:rStyle') # does not add hyperlink style
-    rStyle.set(qn('w:val'), 'Hyperlink')
-    # join all the xml elements, add required text to the w:r element
-    rPr.append(rStyle)
-    new_run.append(rPr)
-    new_run.text = text
-    hyperlink.append(new_run)
-    # create new run object and insert hyperlink
-    r: Run = paragraph.add_run()
-    r._r.append(hyperlink)
-    # add the styling
-    r.font.color.theme_color = MSO_THEME_COLOR_INDEX.HYPERLINK
-    r.font.underline = True
-    return r
-
-def get_approximate_version(path_to_artifact_database: str) -> str:
+    return add_hyperlinks(paragraph, [(url, text)])[0]
+
+def find_major_version_year(path_to_artifact_database: str) -> Optional[str]:
+    """
+    Returns the 'MajorVersionYear' attribute of the first '*Version*'
+    element in the artifact database. The file is parsed incrementally,
+    finished elements are cleared and parsing stops at the first match.
+
+    Keyword arguments
+    path_to_artifact_database -- path to the 'ArtifactDatabase.xml'
+    """
+    import xml.etree.ElementTree as ET
+
+    depth: int = 0
+    root: Optional[ET.Element] = None
+    with open(path_to_artifact_database, "rb") as xml_file:
+        for event, elem in ET.iterparse(xml_file, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                if 'Version' in elem.tag and "MajorVersionYear" in elem.attrib:
+                    return elem.attrib["MajorVersionYear"]
+            else:
+                depth -= 1
+                elem.clear()
+                if depth == 1:
+                    # drop the finished children of the root element
+                    root.clear()
+    return None
+
+def read_version_cache(cache_file: str) -> dict:
+    """Return the persisted artifact database versions or an empty dict"""
+    try:
+        with open(cache_file, "r", encoding="utf-8") as data_file:
+            cache: dict = json.load(data_file)
+            return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def get_approximate_version(path_to_artifact_database: str, cache_file: str = VERSION_CACHE_FILE) -> Optional[str]:
     """
     Returns the latest major release version of legacy/server products as a string.
     The approximate version is the major release version of the legacy/server products.
-    This version is hardcoded in the 'C:/Projects/installer/ArtifactDatabase.xml' file.
+    This version is hardcoded in the 'ArtifactDatabase.xml' file (by default
+    'C:/Projects/installer/ArtifactDatabase.xml').
+
+    The result is cached in memory and in the cache file. A cached version
+    is only used while modification time and size of the file are unchanged.
+    None is returned if the file is missing or no valid XML.
 
     Keyword arguments
-    path_toartifact_database -- path to the 'ArtifactDatabase.xml'
+    path_to_artifact_database -- path to the 'ArtifactDatabase.xml'
+    cache_file                -- JSON file with the persisted versions
     """
     try:
-        tree: ET.ElementTree = ET.parse(path_to_artifact_database)
-        root: ET.Element = tree.getroot()
-        for elem in root.iter():
-            if 'Version' in elem.tag:
-                elemAttributeMap: MutableMapping[str, str] = elem.attrib.items()
-                for elem_name, elem_value in elemAttributeMap:
-                    if elem_name == "MajorVersionYear":
-                        return elem_value
+        stat: os.stat_result = os.stat(path_to_artifact_database)
     except OSError as e:
-        print("ERROR " + str(e.errno) + ": File 'C:/Projects/installer/ArtifactDatabase.xml' not found!")
+        print("ERROR " + str(e.errno) + f": File '{path_to_artifact_database}' not found!")
+        return None
+    key: str = os.path.abspath(path_to_artifact_database)
+    signature: list = [stat.st_mtime_ns, stat.st_size]
+    cached: Optional[dict] = _version_cache.get(key)
+    if cached is None:
+        cached = read_version_cache(cache_file).get(key)
+    if cached and cached.get("signature") == signature:
+        _version_cache[key] = cached
+        return cached["version"]
+
+    import xml.etree.ElementTree as ET
+
+    try:
+        version: Optional[str] = find_major_version_year(path_to_artifact_database)
+    except OSError as e:
+        print("ERROR " + str(e.errno) + f": File '{path_to_artifact_database}' not found!")
+        return None
+    except ET.ParseError as e:
+        print(f"ERROR: File '{path_to_artifact_database}' is no valid XML: {e}")
+        return None
+    _version_cache[key] = {"signature": signature, "version": version}
+    cache: dict = read_version_cache(cache_file)
+    cache[key] = _version_cache[key]
+    try:
+        os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as data_file:
+            json.dump(cache, data_file, indent=2)
+    except OSError:
+        pass # the cache is optional
+    return version
 
 def get_all_templates() -> list:
     """Return a list with all template files plus the relative path"""
-    allTemplates: list = []
-    for root, directories, files in os.walk("..\\..\\templates", topdown=False):
-        for name in files:
-            allTemplates.append(os.path.join(root, name))
-    return allTemplates
+    return TemplateCatalog().get_all_templates()
 
-"""
 def iterate_over_json_file(json_file: str, elem_name: str) -> str:
-    # Return requested element out of JSON file. The data are retrieved
-    # from selected template of get_all_templates()
-    # 
-    # Keyword arguments:
-    # json_file -- path to the json file
-    # elem_name -- name of the element to retrieve value
-    with open(json_file, "r") as data_file:
-        data: dict = json.load(data_file)
-        elemName: str
-        elemValue: str
-        for elemName, elemValue in data.items():
-            if elemName == elem_name:
-                return elemValue
-"""
+    """
+    Return requested element out of JSON file. The data are retrieved
+    from selected template of get_all_templates()
 
-"""             
-def iterate_over_license_section(json_file: str, elem_name: str) -> str:
+    Keyword arguments:
+    json_file -- path to the json file
+    elem_name -- name of the element to retrieve value
+    """
+    data = load_template(json_file).data
+    return data.get(elem_name) if isinstance(data, dict) else None
 
+def iterate_over_license_section(json_file: str, elem_name: str) -> str:
+    """
     Return requested element out of 'license' map in template. The data
     are retrieved from selected template of get_all_templates().
 
     Keyword arguments:
     json_file -- path to the json file
-    elem_name -- name of the element to retrieve value    
+    elem_name -- name of the element to retrieve value
+    """
+    if not json_file:
+        raise ValueError(f"No template found to retrieve '{elem_name}'!")
+    license_section: Optional[LicenseSection] = load_template(json_file).license
+    if license_section is None:
+        raise ValueError(f"Dict 'license' does not exist in template '{json_file}'. Data are not available!")
+    if elem_name not in license_section:
+        raise ValueError(f"Key '{elem_name}' does not exist in template '{json_file}'!")
+    return license_section.get(elem_name)
 
-    with open(json_file, "r") as data_file:
-        data: dict = json.load(data_file)
-        if 'license' not in data:
-            print(f"ERROR: Dict '{elem_name}' does not exist in template. Data are not available!")
-        else:
-            for key in data.items():
-                for i,x in enumerate(key):
-                    if i == 0 and x == "license":
-                        for property,value in data[x].items():
-                            if elem_name not in data[x]:
-                                print(f"ERROR: Key '{elem_name}' does not exist in template!")
-                                exit()
-                            elif elem_name in data[x] and elem_name == property:
-                                return value
-"""
-                                
 def set_paragraph(header_table, row_num: int, cell_num: int, para_num: int) -> Paragraph:
     """Return a paragraph in a table cell
     
@@ -189,6 +357,8 @@ def set_title(doc: Document, format: ParagraphFormat, text: str, boldness: bool,
     boldness  -- set boldness of text
     font_size -- set font size for the text
     """
+    from docx.shared import Pt
+
     title_main_obj: Paragraph = doc.add_paragraph()
     title_main_obj.paragraph_format.alignment = format
     run_main_title: Run = title_main_obj.add_run(text)
@@ -204,6 +374,8 @@ def set_meta_section_table_cell_width(doc_info_section, colum_num: int, inche_nu
     column_int       -- coumn number in table
     inche_num        -- column width
     """
+    from docx.shared import Inches
+
     cell: _Cell
     all_cells_info_sec: Tuple[(_Cell)*3] = doc_info_section.columns[colum_num].cells 
     for cell in all_cells_info_sec:
@@ -228,18 +400,54 @@ def set_sep_line(doc: object, line: str, boldness: bool) -> _Cell:
 def set_main_section_paragraph(main_table, row_num: int, cell_num: int, text: str) -> Paragraph:
     """Returns one paragraph for the main section"""
     para: Paragraph = main_table.rows[row_num].cells[cell_num]
-    text = ""
     para.text = text
     return para
 
+def fill_table(table, values: List[List[CellValue]], alignments: Optional[List[list]] = None, line_spacing_rule=None) -> None:
+    """
+    Fill all cells of a table in one pass. The cells are visited row
+    by row without looking up 'table.rows[row].cells[cell]' per cell.
+
+    A value is a text, a Link (hyperlink if it has an url) or a list
+    of Links shown one after another in the first paragraph of the cell.
+
+    Keyword arguments:
+    table             -- table to fill
+    values            -- values by row and cell
+    alignments        -- optional alignment by row and cell
+    line_spacing_rule -- optional line spacing of all paragraphs
+    """
+    from docx.table import _Cell
+
+    for row_num, (tr, row_values) in enumerate(zip(table._tbl.tr_lst, values)):
+        for cell_num, (tc, value) in enumerate(zip(tr.tc_lst, row_values)):
+            cell_para: Paragraph = _Cell(tc, table).paragraphs[0]
+            if line_spacing_rule is not None:
+                cell_para.paragraph_format.line_spacing_rule = line_spacing_rule
+            links: list = [value] if value is None or isinstance(value, (str, Link)) else value
+            if all(isinstance(link, Link) and link.url for link in links):
+                add_hyperlinks(cell_para, [(link.url, link.text) for link in links])
+                links = []
+            for link in links:
+                if isinstance(link, Link) and link.url:
+                    add_hyperlink(cell_para, link.url, link.text)
+                else:
+                    cell_para.add_run(link.text if isinstance(link, Link) else (link or ""))
+            if alignments is not None:
+                cell_para.alignment = alignments[row_num][cell_num]
+
 def set_footer(footer, row_num: int, text: str, font_size: int) -> Paragraph:
     """Returns footer with text and styling"""
+    from docx.shared import Pt
+
     footer_para: Paragraph = footer.paragraphs[row_num].add_run(text)
     footer_para.font.size = Pt(font_size)
     return footer_para
 
 def set_additional_comment(doc: Document, alignment ,comment: str,font_size: int,rgb_color_red: int,rgb_color_yellow: int,rgb_color_green: int,italic_value: bool,bold_value: bool) -> Paragraph:
     """Returns footer with text and styling"""
+    from docx.shared import Pt, RGBColor
+
     additional_comment_obj: Paragraph = doc.add_paragraph()
     additional_comment_obj.paragraph_format.alignment = alignment
     run_main_title: Run = additional_comment_obj.add_run(comment)
@@ -259,242 +467,1164 @@ def compose_docx_file_name(taxonomy_family_name: str, ws_1: str, version, ws_2:
     composed_file_name: str = taxonomy_family_name + ws_1 + version + ws_2 + general_clause + ws_3 + ph_date + file_extension
     return composed_file_name
 
-def main() -> None:
-    """entry point"""
-    argp: argparse.ArgumentParser = argparse.ArgumentParser(description='Generate license approval file to submit it to David Gast.')
-    argp.add_argument('-family', '--family', help='The taxonomy\'s family name. E.g. EBA, BBK, ...')
-    argp.add_argument('-version', '--version', help='The taxonomy\'s version')
-    args: argparse.Namespace = argp.parse_args()
+def new_document() -> Document:
+    """Return an empty document with the style of the license approval"""
+    from docx import Document
+    from docx.shared import Pt
 
-    # Initialize class with names of cell description
-    objConsts: Constants = Constants()
+    # Customize whole document
+    doc: Document = Document()
+    section_style: _ParagraphStyle = doc.styles['Normal']
+    section_style.font.name = 'Calibri (Body)'
+    section_style.font.size = Pt(12)
+    return doc
 
-    # Initialize modules for colors
-    init()
+def set_header_section(doc: Document, objConsts: Constants) -> None:
+    """
+    Add the header with 'internal usage only' and the main title.
 
-    # set version and family name
-    taxonomy_family_name: str = args.family
-    taxonomy_version: str = args.version
+    Keyword arguments:
+    doc       -- document object
+    objConsts -- constants with the text of the table cells
+    """
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Inches, Pt
 
-    # Retrieve template according to family name
-    if taxonomy_family_name:
-        template: str = ""
-        for i in range(len(get_all_templates())):
-            if taxonomy_family_name.lower() in get_all_templates()[i]:
-                template = get_all_templates()[i]
-
-        # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-        # <LICENSE APPROVAL DOCUMENT>
-        # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-        
-        # Customize whole document
-        doc: Document = Document()
-        section_style: _ParagraphStyle = doc.styles['Normal']
-        section_style.font.name = 'Calibri (Body)'
-        section_style.font.size = Pt(12)
-        # provide access to first section
-        section = doc.sections[0]
-
-        # ------------------------------------------------------------------------------------------------------------------
-        # header section:
-        # ------------------------------------------------------------------------------------------------------------------
-        header: section._Header = section.header
-        # table contains 1 row and 2 cells
-        header_table = header.add_table(1, 2, Inches(12))
-        cell: _Cell
-        for cell in header_table.columns[1].cells:
-            cell.width = Inches(1)
-        # left cell displays 'internal usage only'
-        para_l_cell: _Cell = set_paragraph(header_table, 0, 0, 0)
-        run_l_cell: Run = para_l_cell.add_run(objConsts.get_header_text())
-        run_l_cell.font.size = Pt(11)
-        # right cell displays logo
-        para_r_cell: _Cell = set_paragraph(header_table, 0, 1, 0)
-        run_r_cell = para_r_cell.add_run()
-        # run_r_cell.add_picture("img\\logo.png", width=1380000, height=520000)
-        # set title 'THIRD PARTY SOFTWARE LICENSE APPROVAL FORM'
-        set_title(doc, WD_ALIGN_PARAGRAPH.CENTER, objConsts.get_title_main_section(), True, 13)
-
-        # ------------------------------------------------------------------------------------------------------------------
-        # meta info section about the document
-        # ------------------------------------------------------------------------------------------------------------------
-        # create docx.document.Document object
-        doc_info_section = doc.add_table(rows=3, cols=3)
-        # 'From: Christoph Hartleb (Dev)'
-        set_pargraph_meta_section(doc_info_section, 0, 0, 0, WD_LINE_SPACING.SINGLE, objConsts.get_sender_form(), WD_ALIGN_PARAGRAPH.LEFT)
-        # 'Submitted to Legal by:'
-        set_pargraph_meta_section(doc_info_section, 0, 1, 0, WD_LINE_SPACING.SINGLE, objConsts.get_submission_text_property(), WD_ALIGN_PARAGRAPH.RIGHT)
-        # 'Christoph Hartleb'
-        set_pargraph_meta_section(doc_info_section, 0, 2, 0, WD_LINE_SPACING.SINGLE, objConsts.get_submission_text_name(), WD_ALIGN_PARAGRAPH.LEFT)
-        # 'To: David A. Gast'
-        set_pargraph_meta_section(doc_info_section, 1, 0, 0, WD_LINE_SPACING.SINGLE, objConsts.get_submission_to(), WD_ALIGN_PARAGRAPH.LEFT)
-        # 'Approved/Rejected by Legal:'
-        set_pargraph_meta_section(doc_info_section, 1, 1, 0, WD_LINE_SPACING.SINGLE, objConsts.get_appt_or_rej_text(), WD_ALIGN_PARAGRAPH.RIGHT)
-        # justify type in paragraph is left for each cell
-        set_pargraph_meta_section(doc_info_section, 1, 2, 0, WD_LINE_SPACING.SINGLE, "", WD_ALIGN_PARAGRAPH.LEFT)
-        # 'Submission Date:'                                                                                                               # american date format
-        set_pargraph_meta_section(doc_info_section, 2, 0, 0, WD_LINE_SPACING.SINGLE, objConsts.get_sub_date() + str(datetime.datetime.now().strftime("%Y-%m-%d")), WD_ALIGN_PARAGRAPH.LEFT)
-        # 'DateApproved:'
-        set_pargraph_meta_section(doc_info_section, 2, 1, 0, WD_LINE_SPACING.SINGLE, objConsts.get_date_appr_text(), WD_ALIGN_PARAGRAPH.RIGHT)
-        # 'YYYY-MM-DD' ->  ISO 8601 date format
-        set_pargraph_meta_section(doc_info_section, 2, 2, 0, WD_LINE_SPACING.SINGLE, objConsts.get_date_format(), WD_ALIGN_PARAGRAPH.LEFT)
-
-        set_meta_section_table_cell_width(doc_info_section, 0, 3.6)
-        set_meta_section_table_cell_width(doc_info_section, 1, 3.0)
-        set_meta_section_table_cell_width(doc_info_section, 2, 2.2)
-
-        # separate header section and main section in document 
-        set_sep_line(doc, "________________________________________________________________________", False)
-
-        # ------------------------------------------------------------------------------------------------------------------
-        # main section of the document (deals with meta information about the taxonomy)
-        # ------------------------------------------------------------------------------------------------------------------
-        main_table = doc.add_table(rows=9, cols=2)
-        set_main_section_paragraph(main_table, 0, 0, objConsts.get_third_party_name_prop())
+    # ------------------------------------------------------------------------------------------------------------------
+    # header section:
+    # ------------------------------------------------------------------------------------------------------------------
+    header: _Header = doc.sections[0].header
+    # table contains 1 row and 2 cells
+    header_table = header.add_table(1, 2, Inches(12))
+    cell: _Cell
+    for cell in header_table.columns[1].cells:
+        cell.width = Inches(1)
+    # left cell displays 'internal usage only'
+    para_l_cell: _Cell = set_paragraph(header_table, 0, 0, 0)
+    run_l_cell: Run = para_l_cell.add_run(objConsts.header_text)
+    run_l_cell.font.size = Pt(11)
+    # right cell displays logo
+    para_r_cell: _Cell = set_paragraph(header_table, 0, 1, 0)
+    run_r_cell = para_r_cell.add_run()
+    # run_r_cell.add_picture("img\\logo.png", width=1380000, height=520000)
+    # set title 'THIRD PARTY SOFTWARE LICENSE APPROVAL FORM'
+    set_title(doc, WD_ALIGN_PARAGRAPH.CENTER, objConsts.title_main_section, True, 13)
 
-        # Name of third party software
-        # ----------------------------
-        col_name_h: _Cell = main_table.rows[0].cells[1]
-        col_name_h.text = "xbrl taxonomy" # iterate_over_license_section(template, "swname")
+def set_meta_section(doc: Document, objConsts: Constants, submission_date: str, approval: Optional[Approval] = None) -> None:
+    """
+    Add the meta info section and the separation line below it.
 
-        # Version number or year
-        # -----------------------
-        set_main_section_paragraph(main_table, 1, 0, objConsts.get_version_year_prop())
-        if taxonomy_family_name == "bdp":
-            # two different versions for the taxonomies provided by the Bank of Portugal.
-            # therefore script call : py -3.10 gen_lic_approval.py -family="bdp" -version="2.10.1 5.0.0"
-            set_main_section_paragraph(main_table, 1, 1, taxonomy_version.split(" ")[0]+" bdp v"+taxonomy_version.split(" ")[1])
-        else:
-            set_main_section_paragraph(main_table, 1, 1, taxonomy_version)
-
-        # Is this a version update of 
-        # previously approved software? If 
-        # Yes, reason for update? 
-        # --------------------------------
-        set_main_section_paragraph(main_table, 2, 0, objConsts.get_update_prop())
-        update_version_values: list[str] = ["Yes","No","YES","Yes, update of the ESMA ESEF Common Recommendation (CR) version"]
-        if taxonomy_family_name == "dnb-dict":
-            set_main_section_paragraph(main_table, 2, 1, update_version_values[1])
-        elif taxonomy_family_name == "us-gaap" or taxonomy_family_name == "ifrs" or taxonomy_family_name == "xbrlgl":
-            set_main_section_paragraph(main_table, 2, 1, update_version_values[2])
-        elif taxonomy_family_name == "lei":
-            set_main_section_paragraph(main_table, 2, 1, update_version_values[1])
-        else:
-            set_main_section_paragraph(main_table, 2, 1, update_version_values[0])
+    Keyword arguments:
+    doc             -- document object
+    objConsts       -- constants with the text of the table cells
+    submission_date -- date of the submission in ISO 8601 format
+    approval        -- returned approval filling the approval cells
+    """
+    from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # meta info section about the document
+    # ------------------------------------------------------------------------------------------------------------------
+    # create docx.document.Document object
+    doc_info_section = doc.add_table(rows=3, cols=3)
+    fill_table(
+        doc_info_section,
+        [
+            # 'From: Christoph Hartleb (Dev)', 'Submitted to Legal by:', 'Christoph Hartleb'
+            [objConsts.sender_form, objConsts.submission_text_property, objConsts.submission_text_name],
+            # 'To: David A. Gast', 'Approved/Rejected by Legal:', justify type in paragraph is left for each cell
+            [objConsts.submission_to, objConsts.appt_or_rej_text, approval.status.capitalize() if approval else ""],
+            # 'Submission Date:', 'DateApproved:', 'YYYY-MM-DD' ->  ISO 8601 date format
+            [objConsts.sub_date + submission_date, objConsts.date_appr_text, approval.date if approval else objConsts.date_format]
+        ],
+        alignments=[[WD_ALIGN_PARAGRAPH.LEFT, WD_ALIGN_PARAGRAPH.RIGHT, WD_ALIGN_PARAGRAPH.LEFT]] * 3,
+        line_spacing_rule=WD_LINE_SPACING.SINGLE
+    )
+
+    set_meta_section_table_cell_width(doc_info_section, 0, 3.6)
+    set_meta_section_table_cell_width(doc_info_section, 1, 3.0)
+    set_meta_section_table_cell_width(doc_info_section, 2, 2.2)
+
+    # separate header section and main section in document 
+    set_sep_line(doc, "________________________________________________________________________", False)
+
+def set_footer_section(doc: Document) -> None:
+    """Add the footer with the version of the form"""
+    # ------------------------------------------------------------------------------------------------------------------
+    # footer section
+    # ------------------------------------------------------------------------------------------------------------------
+    footer: Paragraph = doc.sections[0].footer
+    set_footer(footer, 0, "Ver: 01/2022", 10)
+
+def build_skeleton(objConsts: Constants, submission_date: str, approval: Optional[Approval] = None) -> Document:
+    """
+    Return a document with all parts that are the same for every
+    license approval: header, title, meta info section, separation
+    line and footer. The main section is added per taxonomy.
+
+    Keyword arguments:
+    objConsts       -- constants with the text of the table cells
+    submission_date -- date of the submission in ISO 8601 format
+    approval        -- returned approval filling the approval cells
+    """
+    doc: Document = new_document()
+    set_header_section(doc, objConsts)
+    set_meta_section(doc, objConsts, submission_date, approval)
+    set_footer_section(doc)
+    return doc
+
+def get_constants_text(objConsts: Constants) -> List[str]:
+    """Return the text of all constants ordered by their name"""
+    return [getattr(objConsts, name) for name in sorted(objConsts._fields)]
+
+def get_skeleton_key(objConsts: Constants, submission_date: str, approval: Optional[Approval] = None) -> str:
+    """
+    Return the cache key of a document skeleton. It is the hash of all
+    constants, the submission date, the approval and the layout version.
+
+    Keyword arguments:
+    objConsts       -- constants with the text of the table cells
+    submission_date -- date of the submission in ISO 8601 format
+    approval        -- returned approval filling the approval cells
+    """
+    skeleton_hash = hashlib.sha256(SKELETON_LAYOUT_VERSION.encode("utf-8"))
+    for text in get_constants_text(objConsts):
+        skeleton_hash.update(b"\0" + text.encode("utf-8"))
+    skeleton_hash.update(b"\0" + submission_date.encode("utf-8"))
+    if approval:
+        skeleton_hash.update(b"\0" + approval.status.encode("utf-8") + b"\0" + approval.date.encode("utf-8"))
+    return skeleton_hash.hexdigest()
+
+def get_skeleton(objConsts: Constants, approval: Optional[Approval] = None) -> Document:
+    """
+    Return a fresh copy of the document skeleton. The skeleton is
+    composed and serialized only once per process, constants and approval.
+
+    Keyword arguments:
+    objConsts -- constants with the text of the table cells
+    approval  -- returned approval filling the approval cells
+    """
+    from docx import Document
+
+    return Document(BytesIO(get_skeleton_bytes(objConsts, approval)[1]))
+
+def get_skeleton_bytes(objConsts: Constants, approval: Optional[Approval] = None) -> Tuple[str, bytes]:
+    """
+    Return key and serialized document skeleton. The skeleton is
+    composed and serialized only once per process, constants and approval.
+
+    Keyword arguments:
+    objConsts -- constants with the text of the table cells
+    approval  -- returned approval filling the approval cells
+    """
+    submission_date: str = datetime.datetime.now().strftime("%Y-%m-%d")
+    key: str = get_skeleton_key(objConsts, submission_date, approval)
+    skeleton: Optional[bytes] = _skeleton_cache.get(key)
+    if skeleton is None:
+        stream: BytesIO = BytesIO()
+        build_skeleton(objConsts, submission_date, approval).save(stream)
+        skeleton = _skeleton_cache[key] = stream.getvalue()
+        # the key changes with every day and approval in a long-running server
+        while len(_skeleton_cache) > SKELETON_CACHE_SIZE:
+            _skeleton_cache.popitem(last=False)
+    else:
+        _skeleton_cache.move_to_end(key)
+    return key, skeleton
+
+def get_docx_file_name(taxonomy_family_name: str, taxonomy_version: str) -> str:
+    """
+    Return the file name of the license approval of a taxonomy version.
+    The family is part of the name, so families with the same version
+    do not overwrite each other's forms.
+
+    Keyword arguments:
+    taxonomy_family_name -- name of the taxonomy family. E.g.: "eba"
+    taxonomy_version     -- version of the taxonomy
+    """
+    return compose_docx_file_name(
+        taxonomy_family_name,
+        " ",
+        taxonomy_version,
+        " ",
+        "XBRL Taxonomy - Third Party Software License Approval Form",
+        " ",
+        "YYYYMMDD",
+        ".docx"
+    )
 
+def get_input_hash(objConsts: Constants, family_data: FamilyData, taxonomy_version: str, template: str, approximate_version: str, approval: Optional[Approval] = None) -> str:
+    """
+    Return the hash of everything a license approval is composed from:
+    generator version, constants, submission date, registry entry,
+    template file, taxonomy version, approximate version and approval.
+    The submission date is part of the hash, so a document of an earlier
+    day is composed again with the current date. The engine and the
+    compression are left out: both engines compose the same content and
+    the compression only changes the package, use '-force' to apply them
+    to unchanged documents.
+
+    Keyword arguments:
+    objConsts            -- constants with the text of the table cells
+    family_data          -- properties of the taxonomy family from the registry
+    taxonomy_version     -- version of the taxonomy
+    template             -- path to the template of the taxonomy family
+    approximate_version  -- major release version of legacy/server products
+    approval             -- returned approval filling the approval cells
+    """
+    template_data: bytes = b""
+    if template:
+        try:
+            with open(template, "rb") as template_file:
+                template_data = template_file.read()
+        except OSError:
+            pass # composing the document reports the missing template
+    input_hash = hashlib.sha256()
+    submission_date: str = datetime.datetime.now().strftime("%Y-%m-%d")
+    for text in [GENERATOR_VERSION, SKELETON_LAYOUT_VERSION, *get_constants_text(objConsts), submission_date, json.dumps(family_data), taxonomy_version, str(approximate_version)]:
+        input_hash.update(text.encode("utf-8") + b"\0")
+    input_hash.update(template_data)
+    if approval:
+        input_hash.update(b"\0" + approval.status.encode("utf-8") + b"\0" + approval.date.encode("utf-8"))
+    return input_hash.hexdigest()
+
+def get_license_webpage(family_data: FamilyData, template: str) -> Link:
+    """
+    Return the link to the license of a taxonomy. The license page of
+    the template replaces the one of the registry if the family has a
+    template key.
+
+    Keyword arguments:
+    family_data -- properties of the taxonomy family from the registry
+    template    -- path to the template of the taxonomy family
+    """
+    if family_data.license_webpage_template_key:
+        licweb: str = iterate_over_license_section(template, family_data.license_webpage_template_key)
+        return Link(licweb, licweb)
+    return family_data.license_webpage
+
+def get_taxonomy_record(family_data: FamilyData, taxonomy_version: str, template: str) -> TaxonomyRecord:
+    """
+    Return the row of a taxonomy in the taxonomies list, resolved the
+    same way as the main section of its license approval.
+
+    Keyword arguments:
+    family_data      -- properties of the taxonomy family from the registry
+    taxonomy_version -- version of the taxonomy
+    template         -- path to the template of the taxonomy family
+    """
+    from TaxonomiesList import TaxonomyRecord
+
+    license_webpage: Link = get_license_webpage(family_data, template)
+    return TaxonomyRecord(
+        family_data.name,
+        family_data.format_version(taxonomy_version),
+        family_data.update,
+        family_data.homepage.url or family_data.homepage.text,
+        family_data.license_type.text,
+        license_webpage.url or license_webpage.text
+    )
+
+def get_main_section_values(objConsts: Constants, family_data: FamilyData, taxonomy_version: str, template: str, approximate_version: str) -> List[List[CellValue]]:
+    """
+    Return the values of the main section table, one row per property.
+    Both engines render the main section from these values.
+
+    Keyword arguments:
+    objConsts            -- constants with the text of the table cells
+    family_data          -- properties of the taxonomy family from the registry
+    taxonomy_version     -- version of the taxonomy
+    template             -- path to the template of the taxonomy family
+    approximate_version  -- major release version of legacy/server products
+    """
+    license_webpage: Link = get_license_webpage(family_data, template)
+    return [
+        # Name of third party software
+        [objConsts.third_party_name_prop, "xbrl taxonomy"], # iterate_over_license_section(template, "swname")
+        # Version number or year
+        # the taxonomies provided by the Bank of Portugal have two different versions.
+        # therefore script call : py -3.10 gen_lic_approval.py -family="bdp" -version="2.10.1 5.0.0"
+        [objConsts.version_year_prop, family_data.format_version(taxonomy_version)],
+        # Is this a version update of previously approved software? If Yes, reason for update?
+        [objConsts.update_prop, family_data.update],
         # General description of software
-        # -------------------------------
-        set_main_section_paragraph(main_table, 3, 0, objConsts.get_softw_desc_prop())
-        set_main_section_paragraph(main_table, 3, 1, "sw description")# iterate_over_license_section(template, "swdescription"))
-        
+        [objConsts.softw_desc_prop, "sw description"], # iterate_over_license_section(template, "swdescription"))
         # Link to software homepage
-        # -------------------------
-        set_main_section_paragraph(main_table, 4, 0, objConsts.get_link_property_prop())
-        homepage_hyperlink = set_paragraph(main_table, 4, 1, 0)
-        if taxonomy_family_name == "us-gaap":
-            add_hyperlink(homepage_hyperlink, "https://www.example.website.com", "SEC and US GAAP Taxonomies")
-        elif taxonomy_family_name == "bbk":
-            add_hyperlink(homepage_hyperlink, "https://www.landinpage.example.com", "Reporting - Formats(XML and XBRL)")
-        elif taxonomy_family_name == "boe-banking":
-            add_hyperlink(homepage_hyperlink, "https://www.landinpage.example.com", "Regulatory Reporting for the Banking Sector")
-        elif taxonomy_family_name == "cipc":
-            add_hyperlink(homepage_hyperlink, "https://www.landinpage.example.com", "XBRL Programs")
-        elif taxonomy_family_name == "dnb-ftk":
-            add_hyperlink(homepage_hyperlink, "https://www.landinpage.example.com", "Pensionsfondsen")
-        elif taxonomy_family_name == "eiopa":
-            add_hyperlink(homepage_hyperlink, "https://www.landinpage.example.com", "EIOPA - Tools and Data")
-        elif taxonomy_family_name == "sfrdp":
-            add_hyperlink(homepage_hyperlink, "https://www.example.website.com", "https://www.example.website.com")
-        elif taxonomy_family_name == "acpr-corep" or taxonomy_family_name == "acpr-creditimmo" or taxonomy_family_name == "acpr-lcbft":
-            add_hyperlink(homepage_hyperlink, "https://www.example.website.com", "https://www.example.website.com")
+        [objConsts.link_property_prop, family_data.homepage],
+        # License type (e.g. MIT, BSD, GPL)
+        [objConsts.license_prop, family_data.license_type],
+        # Link to website showing license:
+        [objConsts.link_lic_prop, license_webpage],
+        # Products that will introduce license?
+        [objConsts.prod_prop, objConsts.affected_products],
+        # Approximate time/version?
+        [objConsts.time_ver_prop, approximate_version]
+    ]
+
+def set_main_section(doc: Document, objConsts: Constants, family_data: FamilyData, taxonomy_version: str, template: str, approximate_version: str) -> None:
+    """
+    Add the main section with the meta information about the taxonomy.
+
+    Keyword arguments:
+    doc                  -- document object
+    objConsts            -- constants with the text of the table cells
+    family_data          -- properties of the taxonomy family from the registry
+    taxonomy_version     -- version of the taxonomy
+    template             -- path to the template of the taxonomy family
+    approximate_version  -- major release version of legacy/server products
+    """
+    # ------------------------------------------------------------------------------------------------------------------
+    # main section of the document (deals with meta information about the taxonomy)
+    # ------------------------------------------------------------------------------------------------------------------
+    values: List[List[CellValue]] = get_main_section_values(objConsts, family_data, taxonomy_version, template, approximate_version)
+    main_table = doc.add_table(rows=len(values), cols=2)
+    fill_table(main_table, values)
+
+def set_additional_comments_section(doc: Document, family_data: FamilyData) -> None:
+    """
+    Add the additional comments of a taxonomy family.
+
+    Keyword arguments:
+    doc         -- document object
+    family_data -- properties of the taxonomy family from the registry
+    """
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    # ADDITIONAL COMMENTS
+    # ------------------------------------------------------------------------------------------------------------------
+    doc.add_paragraph().add_run("\nADDITIONAL COMMENTS:")
+    comment: Comment
+    for comment in family_data.additional_comments:
+        if comment.url:
+            add_hyperlink(set_additional_comment(doc, WD_ALIGN_PARAGRAPH.LEFT, "", comment.font_size, 82, 82, 82, True, False), comment.url, comment.text)
         else:
-            add_hyperlink(homepage_hyperlink, "https://www.landinpage.example.com", "https://www.landinpage.example.com")
+            set_additional_comment(doc, WD_ALIGN_PARAGRAPH.LEFT, comment.text, comment.font_size, 82, 82, 82, True, False)
 
-        # License type (e.g. MIT, BSD, GPL)
-        # ---------------------------------
-        set_main_section_paragraph(main_table, 5, 0, objConsts.get_license_prop())
-        str_prep_lic_type = "license type"
-        if taxonomy_family_name == "dnb-biscbs" or taxonomy_family_name == "dnb-dict" or taxonomy_family_name == "dnb-ftk":
-            lic_type_hyperlink = set_paragraph(main_table, 5, 1, 0)
-            add_hyperlink(lic_type_hyperlink, "license type", "CC-BY-4.0" )
+def compose_license_approval(objConsts: Constants, family_data: FamilyData, taxonomy_version: str, template: str, approximate_version: str, approval: Optional[Approval] = None) -> Document:
+    """
+    Return the composed license approval document of one taxonomy.
+
+    Keyword arguments:
+    objConsts            -- constants with the text of the table cells
+    family_data          -- properties of the taxonomy family from the registry
+    taxonomy_version     -- version of the taxonomy
+    template             -- path to the template of the taxonomy family
+    approximate_version  -- major release version of legacy/server products
+    approval             -- returned approval filling the approval cells
+    """
+    # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # <LICENSE APPROVAL DOCUMENT>
+    # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    # Copy of the invariant header, title, meta info section and footer
+    with instrumentation.stage("skeleton"):
+        doc: Document = get_skeleton(objConsts, approval)
+    with instrumentation.stage("main_section"):
+        set_main_section(doc, objConsts, family_data, taxonomy_version, template, approximate_version)
+    with instrumentation.stage("additional_comments"):
+        set_additional_comments_section(doc, family_data)
+
+    # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # </LICENSE APPROVAL DOCUMENT>
+    # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    return doc
+
+def render_license_approval_fast(objConsts: Constants, family_data: FamilyData, taxonomy_version: str, template: str, approximate_version: str, compression: Compression = DEFAULT_COMPRESSION, approval: Optional[Approval] = None) -> bytes:
+    """
+    Return the license approval document of one taxonomy as DOCX
+    package rendered directly as OOXML. The result is equivalent to
+    compose_license_approval() but no python-docx objects are built.
+
+    Keyword arguments:
+    objConsts            -- constants with the text of the table cells
+    family_data          -- properties of the taxonomy family from the registry
+    taxonomy_version     -- version of the taxonomy
+    template             -- path to the template of the taxonomy family
+    approximate_version  -- major release version of legacy/server products
+    compression          -- zipfile compression method and level of the package
+    approval             -- returned approval filling the approval cells
+    """
+    import FastEngine as fast
+    from FastEngine import FastDocument, get_static_parts
+
+    with instrumentation.stage("skeleton"):
+        doc: FastDocument = FastDocument(get_static_parts(*get_skeleton_bytes(objConsts, approval)))
+    with instrumentation.stage("main_section"):
+        values: List[List[CellValue]] = get_main_section_values(objConsts, family_data, taxonomy_version, template, approximate_version)
+        doc.append(fast.table([[fast.paragraph(doc.runs(value)) for value in row_values] for row_values in values]))
+
+    # additional comments, same paragraphs as set_additional_comments_section()
+    with instrumentation.stage("additional_comments"):
+        doc.append(fast.paragraph(fast.text_run("\nADDITIONAL COMMENTS:")))
+        comment: Comment
+        for comment in family_data.additional_comments:
+            comment_rpr: str = f'<w:b w:val="0"/><w:i/><w:color w:val="525252"/><w:sz w:val="{comment.font_size * 2}"/>'
+            if comment.url:
+                runs: str = fast.text_run("", comment_rpr) + fast.hyperlink_run(doc.relate_to(comment.url), comment.text)
+            else:
+                runs = fast.text_run(comment.text, comment_rpr)
+            doc.append(fast.paragraph(runs, '<w:jc w:val="left"/>'))
+    with instrumentation.stage("save"):
+        return doc.to_bytes(*compression)
+
+def recompress_package(docx_data: bytes, compression: Compression) -> bytes:
+    """
+    Return a DOCX package with all parts compressed again. python-docx
+    always deflates with the default level.
+
+    Keyword arguments:
+    docx_data   -- DOCX package
+    compression -- zipfile compression method and level of the parts
+    """
+    import zipfile
+
+    stream: BytesIO = BytesIO()
+    with zipfile.ZipFile(BytesIO(docx_data)) as source_zip, zipfile.ZipFile(stream, "w", compression[0], compresslevel=compression[1]) as docx_zip:
+        for info in source_zip.infolist():
+            docx_zip.writestr(info.filename, source_zip.read(info))
+    return stream.getvalue()
+
+def render_license_approval(objConsts: Constants, family_data: FamilyData, taxonomy_version: str, template: str, approximate_version: str, engine: str = "docx", compression: Compression = DEFAULT_COMPRESSION, approval: Optional[Approval] = None) -> bytes:
+    """
+    Return the license approval document of one taxonomy as DOCX package
+    without writing it to disk.
+
+    Keyword arguments:
+    objConsts            -- constants with the text of the table cells
+    family_data          -- properties of the taxonomy family from the registry
+    taxonomy_version     -- version of the taxonomy
+    template             -- path to the template of the taxonomy family
+    approximate_version  -- major release version of legacy/server products
+    engine               -- 'docx' composes with python-docx, 'fast' renders OOXML directly
+    compression          -- zipfile compression method and level of the package
+    approval             -- returned approval filling the approval cells
+    """
+    if engine == "fast":
+        return render_license_approval_fast(objConsts, family_data, taxonomy_version, template, approximate_version, compression, approval)
+    doc: Document = compose_license_approval(objConsts, family_data, taxonomy_version, template, approximate_version, approval)
+    stream: BytesIO = BytesIO()
+    with instrumentation.stage("save"):
+        doc.save(stream)
+    # the document is released before its package is copied out of the stream
+    del doc
+    if compression != DEFAULT_COMPRESSION:
+        with instrumentation.stage("recompress"):
+            return recompress_package(stream.getvalue(), compression)
+    return stream.getvalue()
+
+def generate_license_approval(objConsts: Constants, family_data: FamilyData, taxonomy_version: str, template: str, approximate_version: str, engine: str = "docx", compression: Compression = DEFAULT_COMPRESSION, approval: Optional[Approval] = None) -> str:
+    """
+    Compose the license approval document of one taxonomy, save it
+    in the 'lics' folder and return the name of the generated file.
+
+    Keyword arguments:
+    objConsts            -- constants with the text of the table cells
+    family_data          -- properties of the taxonomy family from the registry
+    taxonomy_version     -- version of the taxonomy
+    template             -- path to the template of the taxonomy family
+    approximate_version  -- major release version of legacy/server products
+    engine               -- 'docx' composes with python-docx, 'fast' renders OOXML directly
+    compression          -- zipfile compression method and level of the package
+    approval             -- returned approval filling the approval cells
+    """
+    # Compose total filename of license approval                                    
+    docx_file_name: str = get_docx_file_name(family_data.name, taxonomy_version)
+
+    # write content and save file
+    docx_data: bytes = render_license_approval(objConsts, family_data, taxonomy_version, template, approximate_version, engine, compression, approval)
+    with instrumentation.stage("write"), open(f"lics/{docx_file_name}", "wb") as docx_file:
+        docx_file.write(docx_data)
+    return docx_file_name
+
+def generate_entry(objConsts: Constants, entry: dict, family_data: FamilyData, template: str, approximate_version: str, approval: Optional[Approval] = None, engine: str = "docx", compression: Compression = DEFAULT_COMPRESSION) -> Tuple[str, str]:
+    """
+    Return the generated file name and an error message for one
+    manifest entry. Exceptions are caught and returned as message
+    so that a broken family does not stop the rest of a batch.
+
+    Keyword arguments:
+    objConsts           -- constants with the text of the table cells
+    entry               -- manifest entry with 'family' and 'version'
+    family_data         -- properties of the taxonomy family from the registry
+    template            -- path to the template of the taxonomy family
+    approximate_version -- major release version of legacy/server products
+    approval            -- returned approval filling the approval cells
+    engine              -- 'docx' composes with python-docx, 'fast' renders OOXML directly
+    compression         -- zipfile compression method and level of the package
+    """
+    try:
+        return generate_license_approval(objConsts, family_data, entry["version"], template, approximate_version, engine, compression, approval), ""
+    except Exception as e:
+        return "", f"{type(e).__name__}: {e}"
+
+def render_entry(objConsts: Constants, entry: dict, family_data: FamilyData, template: str, approximate_version: str, approval: Optional[Approval] = None, engine: str = "docx", compression: Compression = DEFAULT_COMPRESSION) -> Tuple[str, bytes, str]:
+    """
+    Return file name, DOCX package and an error message for one manifest
+    entry without writing to disk. See generate_entry().
+
+    Keyword arguments:
+    objConsts           -- constants with the text of the table cells
+    entry               -- manifest entry with 'family' and 'version'
+    family_data         -- properties of the taxonomy family from the registry
+    template            -- path to the template of the taxonomy family
+    approximate_version -- major release version of legacy/server products
+    approval            -- returned approval filling the approval cells
+    engine              -- 'docx' composes with python-docx, 'fast' renders OOXML directly
+    compression         -- zipfile compression method and level of the package
+    """
+    try:
+        return get_docx_file_name(family_data.name, entry["version"]), render_license_approval(objConsts, family_data, entry["version"], template, approximate_version, engine, compression, approval), ""
+    except Exception as e:
+        return "", b"", f"{type(e).__name__}: {e}"
+
+def get_bundle_file_name() -> str:
+    """Return the path of today's submission bundle, e.g. 'lics/2020-09-09.zip'"""
+    return f"lics/{datetime.date.today().isoformat()}.zip"
+
+def parse_compression(text: str) -> Compression:
+    """
+    Return the zipfile compression of a command line value: 'stored',
+    'deflate' or 'deflate:<level>' with a level from 0 to 9.
+
+    Keyword arguments:
+    text -- value of the '-compression' argument
+    """
+    method, _, level = text.lower().partition(":")
+    if method == "stored" and not level:
+        return (ZIP_STORED, None)
+    if method == "deflate" and not level:
+        return DEFAULT_COMPRESSION
+    if method == "deflate" and level.isdigit() and int(level) <= 9:
+        return (ZIP_DEFLATED, int(level))
+    raise argparse.ArgumentTypeError(f"'{text}' is not 'stored', 'deflate' or 'deflate:0' to 'deflate:9'")
+
+def build_entries(objConsts: Constants, entries: Iterable[dict], family_registry: FamilyRegistry, templates: Iterable[str], approximate_version: str, build_manifest: BuildManifest, engine: str = "docx", jobs: int = 1, force: bool = False, compression: Compression = DEFAULT_COMPRESSION, bundle: Optional[str] = None, taxonomies_list: bool = False, previous_list: Optional[str] = None, profile_dir: Optional[str] = None, approval_store: Optional[ApprovalStore] = None, include_approved: bool = False, queue_size: int = 0, form_names: Optional[List[str]] = None) -> int:
+    """
+    Generate the documents of all entries whose inputs changed since the
+    last build, print the results in the order of the entries and return
+    the number of failed documents.
+
+    The entries are streamed through the stages resolve -> render ->
+    write. Entries and templates may be iterators, e.g. of
+    iterate_manifest(), and are read one at a time. At most 'queue_size'
+    entries wait between resolving and writing, so the memory of a batch
+    does not grow with the number of documents.
+
+    With a bundle all documents are rendered in memory and written to
+    one ZIP archive in a single pass, in a folder named like the archive
+    (e.g. '2020-09-09/'). Nothing is written to 'lics' then and the
+    build manifest is left untouched.
+
+    With 'taxonomies_list' the rows of all documents of the batch are
+    collected in the same pass and written as 'Taxonomies List
+    YYYYMMDD.xlsx' next to the documents, merged with the previous list.
+
+    With an approval store the returned status and date of every entry
+    are filled into its form. Entries already approved are skipped
+    unless 'include_approved' is set.
+
+    Keyword arguments:
+    objConsts           -- constants of the forms
+    entries             -- manifest entries with 'family' and 'version'
+    family_registry     -- registry with the properties of all families
+    templates           -- resolved template of every entry
+    approximate_version -- major version year of the ArtifactDatabase.xml
+    build_manifest      -- recorded inputs of the generated documents
+    engine              -- 'docx' or 'fast', see render_license_approval()
+    jobs                -- number of processes composing documents
+    force               -- generate documents even if they are up to date
+    compression         -- zipfile compression method and level of the packages
+    bundle              -- path of the ZIP archive collecting all documents
+    taxonomies_list     -- write the taxonomies list of the batch
+    previous_list       -- list of the previous cycle (default: the latest in 'lics' or its bundles)
+    profile_dir         -- folder for a cProfile and tracemalloc report per entry
+    approval_store      -- index of the returned approvals, see ApprovalStore
+    include_approved    -- generate the forms of approved entries as well
+    queue_size          -- entries in flight between resolving and writing (default: 2 per job)
+    form_names          -- list the file names of the generated, up to date and approved documents are appended to
+    """
+    from collections import deque
+    import zipfile
+    from Instrumentation import InstrumentedEntry
+    from termcolor import colored
+
+    # the stages measured per entry are returned with the result, also from worker processes
+    generate: InstrumentedEntry = InstrumentedEntry(partial(render_entry if bundle else generate_entry, objConsts, engine=engine, compression=compression), profile_dir)
+    # entries in flight, only queued while worker processes render them
+    queue_size = (queue_size or 2 * jobs) if jobs > 1 else 0
+    queue: Deque[ResolvedEntry] = deque()
+    executor: Optional[Executor] = None
+    # the first document is rendered without starting worker processes
+    rendered_inline: bool = False
+
+    # the packages are compressed already, the bundle only stores them
+    bundle_zip: Optional[zipfile.ZipFile] = zipfile.ZipFile(bundle, "w", zipfile.ZIP_STORED) if bundle else None
+    bundle_folder: str = os.path.splitext(os.path.basename(bundle))[0] if bundle else ""
+    records: List[TaxonomyRecord] = []
+    failures: int = 0
+
+    def resolve(entry: dict, template: str) -> ResolvedEntry:
+        """Resolve the inputs of an entry and whether its document is rendered"""
+        family_data: FamilyData = family_registry.get(entry["family"])
+        entry_approximate_version: str = entry.get("approximate_version") or approximate_version
+        approval: Optional[Approval] = None
+        if approval_store:
+            with instrumentation.stage("approval_lookup"):
+                try:
+                    approval = approval_store.get(family_data.name, family_data.format_version(entry["version"]))
+                except ValueError as e:
+                    return ResolvedEntry(entry, family_data, template, entry_approximate_version, None, "", "failed", f"{type(e).__name__}: {e}", None)
+        # Documents whose inputs are unchanged since the last build are skipped
+        with instrumentation.stage("input_hash"):
+            input_hash: str = get_input_hash(objConsts, family_data, entry["version"], template, entry_approximate_version, approval)
+        status: str = "pending"
+        if approval and approval.status == "approved" and not include_approved:
+            status = "approved"
+        elif not force and not bundle and build_manifest.is_current(f"lics/{get_docx_file_name(family_data.name, entry['version'])}", input_hash):
+            status = "up_to_date"
+        return ResolvedEntry(entry, family_data, template, entry_approximate_version, approval, input_hash, status, "", None)
+
+    def write(resolved: ResolvedEntry) -> None:
+        """Write the document of an entry and print its result"""
+        nonlocal failures
+        entry: dict = resolved.entry
+        if taxonomies_list:
+            try:
+                records.append(get_taxonomy_record(resolved.family_data, entry["version"], resolved.template))
+            except ValueError:
+                pass # the document fails for the same reason and reports it
+        if resolved.status in ("approved", "up_to_date"):
+            docx_file_name: str = get_docx_file_name(resolved.family_data.name, entry["version"])
+            if form_names is not None:
+                form_names.append(docx_file_name)
+            if resolved.status == "approved":
+                instrumentation.count("approved")
+                print("Already approved: "+colored(docx_file_name, 'yellow')+f" ({resolved.approval.date})")
+            else:
+                instrumentation.count("up_to_date")
+                print("Up to date: "+colored(docx_file_name, 'yellow'))
+            return
+        if resolved.status == "failed":
+            error: str = resolved.error
         else:
-            set_main_section_paragraph(main_table, 5, 1, str_prep_lic_type)
+            if resolved.future:
+                result, stages = resolved.future.result()
+            else:
+                result, stages = generate(entry, resolved.family_data, resolved.template, resolved.approximate_version, resolved.approval)
+            instrumentation.merge(stages)
+            if bundle_zip:
+                docx_file_name, docx_data, error = result
+            else:
+                docx_file_name, error = result
+        if error:
+            failures += 1
+            instrumentation.count("failed")
+            print(colored(f"ERROR: Family '{entry['family']}' version '{entry['version']}' failed: {error}", 'red'))
+            return
+        instrumentation.count("generated")
+        if form_names is not None:
+            form_names.append(docx_file_name)
+        if bundle_zip:
+            with instrumentation.stage("bundle_write"):
+                bundle_zip.writestr(f"{bundle_folder}/{docx_file_name}", docx_data)
+            print("Bundled: "+colored(docx_file_name, 'yellow'))
+        else:
+            build_manifest.record(f"lics/{docx_file_name}", resolved.input_hash)
+            print(colored("\nDocument successfully generated!", 'green')+"\n"+colored("-" * 32, 'green')+"\n"+"Your generated file: "+colored(docx_file_name, 'yellow') + " can be found at './YYYY-MM-DD/'")
 
-        # Link to website showing license:
-        # --------------------------------
-        set_main_section_paragraph(main_table, 6, 0, objConsts.get_link_lic_prop())
-        licweb_hyperlink = set_paragraph(main_table, 6, 1, 0)
-        if taxonomy_family_name == "us-gaap":
-            add_hyperlink(licweb_hyperlink, "webpage of license", "Terms and Conditions")
-        elif taxonomy_family_name == "bdp":
-            add_hyperlink(licweb_hyperlink, "webpage of license", "Disclaimer and Copyright")
-        elif taxonomy_family_name == "eiopa":
-            add_hyperlink(licweb_hyperlink, "webpage of license", "EIOPA DPM and Taxonomy License")
-        elif taxonomy_family_name == "acpr-corep" or taxonomy_family_name == "acpr-creditimmo" or taxonomy_family_name == "acpr-lcbft" or taxonomy_family_name == "bbk":
-            set_main_section_paragraph(main_table, 6, 1, "webpage of license")
+    try:
+        for entry, template in zip(entries, templates):
+            with instrumentation.stage("resolve"):
+                resolved: ResolvedEntry = resolve(entry, template)
+            if resolved.status == "pending" and queue_size:
+                if executor is None and not rendered_inline:
+                    rendered_inline = True
+                else:
+                    if executor is None:
+                        from concurrent.futures import ProcessPoolExecutor
+                        executor = ProcessPoolExecutor(max_workers=jobs)
+                    resolved = resolved._replace(future=executor.submit(generate, entry, resolved.family_data, resolved.template, resolved.approximate_version, resolved.approval))
+            queue.append(resolved)
+            # the queue keeps the order of the manifest and bounds the rendered documents held in memory
+            while len(queue) > queue_size:
+                write(queue.popleft())
+        while queue:
+            write(queue.popleft())
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    if taxonomies_list:
+        with instrumentation.stage("taxonomies_list"):
+            write_batch_taxonomies_list(records, bundle_zip, bundle_folder, previous_list)
+    if bundle_zip:
+        bundle_zip.close()
+        print(colored(f"\nSubmission bundle: {bundle}", 'green'))
+        return failures
+    try:
+        build_manifest.save()
+    except OSError as e:
+        print(f"ERROR: Build manifest '{BUILD_MANIFEST_FILE}' could not be written: {e}")
+    return failures
+
+def write_batch_taxonomies_list(records: List[TaxonomyRecord], bundle_zip: Optional[zipfile.ZipFile], bundle_folder: str, previous_list: Optional[str]) -> None:
+    """
+    Write the taxonomies list of a batch into the bundle or the 'lics'
+    folder. The entries of the previous list are kept, new and changed
+    entries are marked yellow. A list written to 'lics' earlier the same
+    day is merged as well, its entries are marked against the previous
+    list like the ones of the batch.
+
+    Keyword arguments:
+    records       -- rows of the documents of the batch
+    bundle_zip    -- open submission bundle or None
+    bundle_folder -- folder of the documents in the bundle
+    previous_list -- list of the previous cycle (default: the latest in 'lics' or its bundles)
+    """
+    import xml.etree.ElementTree as ET
+    import zipfile
+    from TaxonomiesList import find_previous_taxonomies_list, get_taxonomies_list_name, merge_taxonomies_list, read_taxonomies_list, write_taxonomies_list
+    from termcolor import colored
+
+    list_name: str = get_taxonomies_list_name(datetime.date.today().strftime("%Y%m%d"))
+    previous_list = previous_list or find_previous_taxonomies_list("lics", list_name)
+    previous: List[TaxonomyRecord] = []
+    if previous_list:
+        try:
+            previous = read_taxonomies_list(previous_list)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile, ET.ParseError) as e:
+            print(f"ERROR: Previous list '{previous_list}' could not be read: {e}")
+    # the batch replaces the entries of the same family and version of an earlier batch of today
+    today_list: str = f"lics/{list_name}"
+    if not bundle_zip and os.path.isfile(today_list):
+        try:
+            records = list({record.key(): record for record in [*read_taxonomies_list(today_list), *records]}.values())
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile, ET.ParseError) as e:
+            print(f"ERROR: List '{today_list}' could not be read, it is replaced: {e}")
+    rows: List[Tuple[TaxonomyRecord, bool]] = merge_taxonomies_list(previous, records)
+    if bundle_zip:
+        stream: BytesIO = BytesIO()
+        write_taxonomies_list(stream, rows)
+        bundle_zip.writestr(f"{bundle_folder}/{list_name}", stream.getvalue())
+    else:
+        write_taxonomies_list(today_list, rows)
+    marked: int = sum(1 for _, is_marked in rows if is_marked)
+    print(colored(f"\nTaxonomies list: {list_name} ({marked} new or changed of {len(rows)} entries" + (f", merged with '{previous_list}')" if previous else ")"), 'green'))
+
+def check_entry(family_registry: FamilyRegistry, entry: dict, template: str) -> List[Tuple[str, str]]:
+    """
+    Return the problems of one manifest entry as pairs of severity
+    ('ERROR' or 'WARNING') and message. The inputs are resolved the same
+    way as for rendering, but no document is composed.
+
+    Keyword arguments:
+    family_registry -- registry with the properties of all families
+    entry           -- manifest entry with 'family' and an optional 'version'
+    template        -- resolved template of the entry
+    """
+    from difflib import get_close_matches
+
+    problems: List[Tuple[str, str]] = []
+    family_name: str = entry["family"]
+    if family_name not in family_registry:
+        # a near miss like 'us gaap' for 'us-gaap' silently gets the default entry
+        close_matches: List[str] = get_close_matches(family_name.lower(), list(family_registry.families), n=1, cutoff=0.8)
+        if close_matches:
+            problems.append(("ERROR", f"Family '{family_name}' is not in the registry, did you mean '{close_matches[0]}'?"))
         else:
-            add_hyperlink(licweb_hyperlink, "webpage of license", "webpage of license")
-        
-        if taxonomy_family_name == "boe-statistics" or taxonomy_family_name == "boe-banking" or taxonomy_family_name == "boe-insurance":
-            add_hyperlink(licweb_hyperlink, iterate_over_license_section(template, "licweb1"), iterate_over_license_section(template, "licweb1"))
+            problems.append(("WARNING", f"Family '{family_name}' is not in the registry, the default entry is used"))
+    family_data: FamilyData = family_registry.get(family_name)
 
-        # Products that will introduce license?
-        # --------------------------------------------
-        set_main_section_paragraph(main_table, 7, 0, objConsts.get_prod_prop())
-        set_main_section_paragraph(main_table, 7, 1, objConsts.get_affected_products())
+    if "version" in entry:
+        if not entry["version"]:
+            problems.append(("ERROR", "No version given"))
+        else:
+            try:
+                family_data.format_version(entry["version"])
+            except ValueError as e:
+                problems.append(("ERROR", str(e)))
 
-        # Approximate time/version?
-        # -------------------------
-        set_main_section_paragraph(main_table, 8, 0, objConsts.get_time_ver_prop())
-        set_main_section_paragraph(main_table, 8, 1, (get_approximate_version('C:/Projects/installer/ArtifactDatabase.xml')))
-
-        # ADDITIONAL COMMENTS
-        # ------------------------------------------------------------------------------------------------------------------
-        doc.add_paragraph().add_run("\nADDITIONAL COMMENTS:")
-        if taxonomy_family_name == "dnb-biscbs" or taxonomy_family_name == "us gaap" or taxonomy_family_name == "boe-banking" or taxonomy_family_name == "cmf-cl-ci" or taxonomy_family_name == "eiopa" or taxonomy_family_name == "ifrs" or taxonomy_family_name == "acpr-corep" or taxonomy_family_name == "cipc":
-            set_additional_comment(doc,WD_ALIGN_PARAGRAPH.LEFT,"Aditional comment 0",10,82,82,82,True,False)
-        elif taxonomy_family_name == "eurofiling":
-            set_additional_comment(doc,WD_ALIGN_PARAGRAPH.LEFT,"Additional comment",10,82,82,82,True,False)
-        elif taxonomy_family_name == "us-gaap":
-            set_additional_comment(doc,WD_ALIGN_PARAGRAPH.LEFT,"Aditional comment 0",8,82,82,82,True,False)
-        elif taxonomy_family_name == "bbk":
-            add_hyperlink(set_additional_comment(doc, WD_ALIGN_PARAGRAPH.LEFT, "", 8, 82, 82, 82, True, False),"Aditional comment 0","Aditional comment 0")
-        elif taxonomy_family_name == "bdp" or taxonomy_family_name == "cbi" or taxonomy_family_name == "cbi-fsp":
-            set_additional_comment(doc, WD_ALIGN_PARAGRAPH.LEFT,"Aditional comment 0",10,82,82,82,True,False)
-        elif taxonomy_family_name == "edinet":
-            add_hyperlink(set_additional_comment(doc, WD_ALIGN_PARAGRAPH.LEFT, "", 8, 82, 82, 82, True, False),"Aditional comment 0","Aditional comment 0")
-            set_additional_comment(doc,WD_ALIGN_PARAGRAPH.LEFT,"Additional comment",11,82,82,82,True,False)
+    if entry.get("template") and not os.path.isfile(entry["template"]):
+        problems.append(("ERROR", f"Template '{entry['template']}' does not exist"))
+    elif family_data.license_webpage_template_key:
+        try:
+            get_license_webpage(family_data, template)
+        except (OSError, ValueError) as e:
+            problems.append(("ERROR", str(e)))
+    elif template:
+        try:
+            load_template(template)
+        except (OSError, ValueError) as e:
+            problems.append(("ERROR", f"Template '{template}' is not valid JSON: {e}"))
+    return problems
+
+def check_entries(objConsts: Constants, entries: List[dict], family_registry: FamilyRegistry, templates: List[str], approximate_version: Optional[str], jobs: int = 1) -> int:
+    """
+    Check the inputs of all entries concurrently without composing a
+    document, print every problem and return the number of errors.
+
+    Keyword arguments:
+    objConsts           -- constants of the forms
+    entries             -- manifest entries with 'family' and an optional 'version'
+    family_registry     -- registry with the properties of all families
+    templates           -- resolved template of every entry
+    approximate_version -- major version year of the ArtifactDatabase.xml
+    jobs                -- number of threads checking entries
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from termcolor import colored
+
+    # the checks mostly wait for template files, threads are sufficient
+    with ThreadPoolExecutor(max_workers=max(jobs, min(8, os.cpu_count() or 1))) as executor:
+        results: List[List[Tuple[str, str]]] = list(executor.map(partial(check_entry, family_registry), entries, templates))
+
+    if not approximate_version and any(not entry.get("approximate_version") for entry in entries):
+        results.append([("ERROR", "No major version year found in the ArtifactDatabase.xml")])
+    # a later entry of the same family and version overwrites the document of an earlier one
+    entries_by_file: Dict[str, int] = {}
+    for entry in entries:
+        if entry.get("version"):
+            docx_file_name: str = get_docx_file_name(entry["family"], entry["version"])
+            entries_by_file[docx_file_name] = entries_by_file.get(docx_file_name, 0) + 1
+    for docx_file_name, count in entries_by_file.items():
+        if count > 1:
+            results.append([("ERROR", f"{count} entries are all written to '{docx_file_name}'")])
+
+    errors: int = 0
+    warnings: int = 0
+    for i, problems in enumerate(results):
+        label: str = f"{entries[i]['family']}" + (f" {entries[i]['version']}" if entries[i].get("version") else "") if i < len(entries) else "batch"
+        for severity, message in problems:
+            if severity == "ERROR":
+                errors += 1
+                print(colored(f"ERROR: {label}: {message}", 'red'))
+            else:
+                warnings += 1
+                print(colored(f"WARNING: {label}: {message}", 'yellow'))
+    print(colored(f"\nChecked {len(entries)} entries: {errors} errors, {warnings} warnings", 'red' if errors else 'green'))
+    return errors
+
+def report_form_diff(objConsts: Constants, previous_location: str, current_location: str, names: Optional[List[str]] = None) -> None:
+    """
+    Print which forms are new, changed or unchanged compared to the
+    forms of the previous cycle, with the changed main table values.
+
+    Keyword arguments:
+    objConsts         -- constants with the labels of the main table
+    previous_location -- dated folder or bundle of the previous cycle
+    current_location  -- folder or bundle with the current forms
+    names             -- file names of the current forms to compare (default: all)
+    """
+    import zipfile
+    from FormDiff import FormDiff, diff_forms, summarize_forms
+    from termcolor import colored
+
+    labels: List[str] = [
+        objConsts.third_party_name_prop, objConsts.version_year_prop, objConsts.update_prop,
+        objConsts.softw_desc_prop, objConsts.link_property_prop, objConsts.license_prop,
+        objConsts.link_lic_prop, objConsts.prod_prop, objConsts.time_ver_prop
+    ]
+    try:
+        diffs: List[FormDiff] = diff_forms(
+            summarize_forms(previous_location, labels, [objConsts.sub_date]),
+            summarize_forms(current_location, labels, [objConsts.sub_date], names)
+        )
+    except (OSError, KeyError, zipfile.BadZipFile, SyntaxError) as e:
+        print(f"ERROR: Forms could not be compared with '{previous_location}': {e}")
+        return
+
+    colors: Dict[str, str] = {"new": 'green', "changed": 'yellow', "unchanged": 'white'}
+    print(f"\nForms compared with '{previous_location}':")
+    for diff in diffs:
+        print(colored(f"  {diff.status.upper():<10} {diff.name}", colors[diff.status]))
+        for label, old_value, new_value in diff.changed_fields:
+            print(f"             {' '.join(label.split())} '{old_value}' -> '{new_value}'")
+        if diff.status == "changed" and not diff.changed_fields:
+            print("             changes outside of the main table")
+    counts: Dict[str, int] = {status: sum(1 for diff in diffs if diff.status == status) for status in colors}
+    print(f"{counts['new']} new, {counts['changed']} changed, {counts['unchanged']} unchanged forms")
+
+def write_metrics(paths: Optional[List[str]]) -> None:
+    """
+    Write the stage timers and counters of the run.
+
+    Keyword arguments:
+    paths -- metrics files, Prometheus textfiles end with '.prom', all others are JSON
+    """
+    for path in paths or []:
+        try:
+            instrumentation.write(path)
+        except OSError as e:
+            print(f"ERROR: Metrics '{path}' could not be written: {e}")
+
+def resolve_templates(entries: Iterable[dict], template_catalog: TemplateCatalog) -> Iterator[str]:
+    """
+    Yield the template of every entry, the override of the entry or the
+    match of the catalog.
+
+    Keyword arguments:
+    entries          -- manifest entries with 'family'
+    template_catalog -- catalog of the templates trees
+    """
+    for entry in entries:
+        with instrumentation.stage("template_lookup"):
+            template: str = entry.get("template") or template_catalog.find(entry["family"]) or ""
+        yield template
+
+def report_peak_rss(max_rss: int, workers: bool = False) -> bool:
+    """
+    Print the peak memory of the main process and the workers and an
+    error if one of them exceeds the limit. Return True if the limit
+    was exceeded.
+
+    Keyword arguments:
+    max_rss -- limit of the peak resident set size in MB
+    workers -- the batch was composed by worker processes
+    """
+    from Instrumentation import get_peak_rss
+    from termcolor import colored
+
+    exceeded: bool = False
+    peaks: List[Tuple[str, Optional[int]]] = [("main process", get_peak_rss())]
+    if workers:
+        peaks.append(("workers", get_peak_rss(children=True)))
+    for name, peak in peaks:
+        if not peak:
+            continue
+        peak_mb: float = peak / (1024 * 1024)
+        if peak_mb > max_rss:
+            print(colored(f"ERROR: Peak memory of the {name} {peak_mb:.0f} MB exceeds the limit of {max_rss} MB!", 'red'))
+            exceeded = True
         else:
-            set_additional_comment(doc,WD_ALIGN_PARAGRAPH.LEFT,"Aditional comment 0",11,82,82,82,True,False)
-
-        # ------------------------------------------------------------------------------------------------------------------
-        # footer section
-        # ------------------------------------------------------------------------------------------------------------------
-        footer: Paragraph = section.footer
-        set_footer(footer, 0, "Ver: 01/2022", 10)
-
-        # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-        # </LICENSE APPROVAL DOCUMENT>
-        # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-
-        # Compose total filename of license approval                                    
-        docx_file_name = compose_docx_file_name(
-            "filebasename",
-            " ",
-            taxonomy_version,
-            " ",
-            "XBRL Taxonomy - Third Party Software License Approval Form",
-            " ",
-            "YYYYMMDD",
-            ".docx"
-        ) 
-
-        # write content and save file
-        doc.save(f"lics/{docx_file_name}")  
-        print(colored("\nDocument successfully generated!", 'green')+"\n"+colored("-" * 32, 'green')+"\n"+"Your generated file: "+colored(docx_file_name, 'yellow') + " can be found at './YYYY-MM-DD/'")
-    
-    elif not taxonomy_family_name:
+            print(f"Peak memory of the {name}: {peak_mb:.0f} MB (limit {max_rss} MB)")
+    return exceeded
+
+def watch_entries(objConsts: Constants, entries: List[dict], template_catalog: TemplateCatalog, family_registry: FamilyRegistry, approximate_version: str, build_manifest: BuildManifest, args: argparse.Namespace, approval_store: Optional[ApprovalStore] = None) -> None:
+    """
+    Watch the templates tree, the family registry and the
+    ArtifactDatabase.xml and generate the documents of the entries
+    affected by a change until the process is interrupted.
+
+    A changed template affects the entries resolving to it, a new or
+    removed template the entries whose lookup resolves differently, a
+    changed registry the entries whose family properties changed and
+    a changed ArtifactDatabase.xml all entries using its version.
+
+    Keyword arguments:
+    objConsts           -- constants of the forms
+    entries             -- manifest entries with 'family' and 'version'
+    template_catalog    -- catalog of the current templates tree
+    family_registry     -- registry with the properties of all families
+    approximate_version -- major version year of the ArtifactDatabase.xml
+    build_manifest      -- recorded inputs of the generated documents
+    args                -- command line arguments
+    approval_store      -- index of the returned approvals, see ApprovalStore
+    """
+    from FileWatcher import FileWatcher
+    from termcolor import colored
+
+    templates: List[str] = [entry.get("template") or template_catalog.find(entry["family"]) or "" for entry in entries]
+    artifact_database: str = os.path.abspath(args.artifact_database)
+    registry_file: str = os.path.abspath(args.registry)
+    watcher: FileWatcher = FileWatcher(template_catalog.roots + [artifact_database, registry_file] + [template for template in templates if template])
+    print(colored(f"\nWatching '{os.pathsep.join(template_catalog.roots)}', '{args.artifact_database}' and '{args.registry}' (Ctrl+C to stop)", 'cyan'))
+    try:
+        for changed in watcher.changes(args.interval):
+            affected: set = set()
+
+            if artifact_database in changed:
+                new_approximate_version: Optional[str] = get_approximate_version(args.artifact_database)
+                if new_approximate_version != approximate_version:
+                    approximate_version = new_approximate_version
+                    affected.update(i for i, entry in enumerate(entries) if not entry.get("approximate_version"))
+
+            if registry_file in changed:
+                try:
+                    new_registry: FamilyRegistry = FamilyRegistry(args.registry)
+                except (OSError, ValueError) as e:
+                    print(f"ERROR: {e}") # keep the last valid registry
+                else:
+                    affected.update(i for i, entry in enumerate(entries) if new_registry.get(entry["family"]) != family_registry.get(entry["family"]))
+                    family_registry = new_registry
+
+            if template_catalog.is_stale():
+                template_catalog = TemplateCatalog(template_catalog.roots)
+            for i, entry in enumerate(entries):
+                template: str = entry.get("template") or template_catalog.find(entry["family"]) or ""
+                if template != templates[i] or (template and os.path.abspath(template) in changed):
+                    templates[i] = template
+                    affected.add(i)
+
+            if not affected:
+                continue
+            indices: List[int] = sorted(affected)
+            print(colored(f"\n{len(changed)} changed files affect {len(indices)} documents", 'cyan'))
+            failures: int = build_entries(objConsts, [entries[i] for i in indices], family_registry, [templates[i] for i in indices], approximate_version, build_manifest, args.engine, args.jobs, compression=args.compression, profile_dir=args.profile, approval_store=approval_store, include_approved=args.include_approved)
+            if failures:
+                print(colored(f"\n{failures} of {len(indices)} documents could not be generated!", 'red'))
+            write_metrics(args.metrics)
+    except KeyboardInterrupt:
+        pass
+
+def main() -> None:
+    """entry point"""
+    argp: argparse.ArgumentParser = argparse.ArgumentParser(description='Generate license approval file to submit it to David Gast.')
+    argp.add_argument('-family', '--family', help='The taxonomy\'s family name. E.g. EBA, BBK, ...')
+    argp.add_argument('-version', '--version', help='The taxonomy\'s version')
+    argp.add_argument('-manifest', '--manifest', help='CSV, JSON or JSONL file with one family/version entry per form')
+    argp.add_argument('-artifact-database', '--artifact-database', default=ARTIFACT_DATABASE, help='Path to the \'ArtifactDatabase.xml\' (default: $ARTIFACT_DATABASE or %(default)s)')
+    argp.add_argument('-constants', '--constants', help='JSON profile replacing the text of the forms, e.g. sender or legal recipient')
+    argp.add_argument('-templates', '--templates', action='append', help='Root of a templates tree (repeatable, default: $TEMPLATES_DIRS or ../../templates)')
+    argp.add_argument('-registry', '--registry', default=FAMILY_REGISTRY_FILE, help='JSON file with the properties of all taxonomy families')
+    argp.add_argument('-jobs', '--jobs', type=int, default=1, help='Number of processes composing documents in parallel')
+    argp.add_argument('-engine', '--engine', choices=["docx", "fast"], default="docx", help='Compose with python-docx or render the OOXML directly (fast)')
+    argp.add_argument('-serve', '--serve', action='store_true', help='Keep running and answer generate requests over HTTP')
+    argp.add_argument('-port', '--port', type=int, default=8765, help='Port of the server on localhost (default: %(default)s)')
+    argp.add_argument('-socket', '--socket', help='Unix socket of the server instead of the localhost port')
+    argp.add_argument('-bundle', '--bundle', nargs='?', const='', help='Write all documents into one dated ZIP archive (default: lics/YYYY-MM-DD.zip) instead of single files')
+    argp.add_argument('-compression', '--compression', type=parse_compression, default=DEFAULT_COMPRESSION, help='Compression of the DOCX packages: stored, deflate or deflate:0-9 (default: deflate)')
+    argp.add_argument('-taxonomies-list', '--taxonomies-list', action='store_true', help='Also write the \'Taxonomies List YYYYMMDD.xlsx\' of the batch')
+    argp.add_argument('-previous-list', '--previous-list', help='Taxonomies list of the previous cycle to merge with (default: the latest in \'lics\' or its bundles)')
+    argp.add_argument('-diff', '--diff', help='Compare the forms with the dated folder or bundle of the previous cycle and report new and changed forms of the batch')
+    argp.add_argument('-metrics', '--metrics', action='append', help='Write stage timings and counters to this file, a Prometheus textfile if it ends with .prom and JSON otherwise (repeatable)')
+    argp.add_argument('-profile', '--profile', help='Write a cProfile and a tracemalloc report per family to this folder and count allocations per stage')
+    argp.add_argument('-watch', '--watch', action='store_true', help='Keep running and regenerate the documents affected by changed templates, registry or ArtifactDatabase.xml')
+    argp.add_argument('-interval', '--interval', type=float, default=1.0, help='Seconds between two checks for changed files in watch mode (default: %(default)s)')
+    argp.add_argument('-check', '--check', action='store_true', help='Only check the inputs of all entries (default: every family of the registry) and exit with 1 on errors')
+    argp.add_argument('-force', '--force', action='store_true', help='Compose all documents, even if their inputs are unchanged today (engine and compression are not compared)')
+    argp.add_argument('-queue-size', '--queue-size', type=int, default=0, help='Documents in flight between resolving and writing with several jobs (default: 2 per job)')
+    argp.add_argument('-max-rss', '--max-rss', type=int, help='Report the peak memory of the batch and fail if it exceeds this many MB')
+    argp.add_argument('-ingest-approvals', '--ingest-approvals', help='Index the returned spreadsheets and mails of all dated folders below this folder')
+    argp.add_argument('-include-approved', '--include-approved', action='store_true', help='Also generate the forms of entries that are already approved')
+    args: argparse.Namespace = argp.parse_args()
+    # a document needs the version like every manifest entry, only a check works without
+    if args.family and not args.version and not (args.manifest or args.check or args.serve):
+        argp.error("argument -family: a -version is required to generate a document")
+
+    # Initialize modules for colors
+    from colorama import init
+    from termcolor import colored
+    init()
+
+    if args.serve:
+        from GeneratorServer import GeneratorState, serve
+        try:
+            state: GeneratorState = GeneratorState(args.templates or TEMPLATES_DIRS, args.registry, args.artifact_database, args.engine, args.constants)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        serve(state, port=args.port, unix_socket=args.socket)
+        return
+
+    if args.profile:
+        import tracemalloc
+        # allocations are counted per stage while tracing
+        tracemalloc.start()
+        os.makedirs(args.profile, exist_ok=True)
+
+    approval_store: Optional[ApprovalStore] = None
+    if args.ingest_approvals or os.path.exists(APPROVALS_DB):
+        import sqlite3
+        from ApprovalStore import ApprovalStore
+        try:
+            approval_store = ApprovalStore(APPROVALS_DB)
+        except sqlite3.Error as e:
+            print(f"ERROR: Approvals '{APPROVALS_DB}' could not be opened: {e}")
+            sys.exit(1)
+    if args.ingest_approvals:
+        with instrumentation.stage("ingest_approvals"):
+            try:
+                parsed, stored, problems = approval_store.ingest(args.ingest_approvals)
+            except (OSError, sqlite3.Error) as e:
+                print(f"ERROR: Approvals could not be ingested: {e}")
+                sys.exit(1)
+        for problem in problems:
+            print(colored(f"ERROR: {problem}", 'red'))
+        print(colored(f"Approvals: {stored} returns of {parsed} changed folders indexed in '{APPROVALS_DB}'", 'green'))
+        if not args.manifest and not args.family:
+            write_metrics(args.metrics)
+            return
+
+    if args.manifest:
+        try:
+            if args.check or args.watch:
+                entries: Iterable[dict] = read_manifest(args.manifest)
+                entry_count: int = len(entries)
+            else:
+                # validated and counted first, the build streams the entries again
+                entry_count = sum(1 for _ in iterate_manifest(args.manifest))
+                entries = iterate_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+    elif args.family:
+        entries = [{"family": args.family, "version": args.version}]
+        entry_count = 1
+    elif args.check:
+        entries = [] # every family of the registry
+    else:
         print(f"ERROR: Taxonomy family {args.family} not found!")
+        sys.exit(1)
+
+    # Shared state is loaded once and reused for every form of a batch
+    try:
+        objConsts: Constants = load_constants(args.constants) if args.constants else DEFAULT_CONSTANTS
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    template_catalog: TemplateCatalog = TemplateCatalog(args.templates or TEMPLATES_DIRS)
+    try:
+        with instrumentation.stage("load_registry"):
+            family_registry: FamilyRegistry = FamilyRegistry(args.registry)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    with instrumentation.stage("approximate_version"):
+        approximate_version: Optional[str] = get_approximate_version(args.artifact_database)
+
+    if args.check and not entries:
+        entries = [{"family": family_name} for family_name in sorted(family_registry.families)]
+    # Retrieve template according to family name
+    templates: Iterable[str]
+    if not isinstance(entries, list):
+        # resolved while the entries are streamed through the build
+        entries, template_entries = itertools.tee(entries)
+        templates = resolve_templates(template_entries, template_catalog)
+    elif len(entries) == 1 and not args.watch:
+        with instrumentation.stage("template_lookup"):
+            # an exact match only needs the directories named like the family, prefix matches need the catalog
+            templates = [entries[0].get("template") or find_template(entries[0]["family"], template_catalog.roots) or template_catalog.find(entries[0]["family"]) or ""]
+    else:
+        templates = list(resolve_templates(entries, template_catalog))
+    if args.check:
+        with instrumentation.stage("check"):
+            errors: int = check_entries(objConsts, entries, family_registry, templates, approximate_version, args.jobs)
+        write_metrics(args.metrics)
+        sys.exit(1 if errors else 0)
+
+    build_manifest: BuildManifest = BuildManifest(BUILD_MANIFEST_FILE)
+    bundle: Optional[str] = (args.bundle or get_bundle_file_name()) if args.bundle is not None else None
+    if bundle:
+        try:
+            os.makedirs(os.path.dirname(bundle) or ".", exist_ok=True)
+        except OSError as e:
+            print(f"ERROR: Folder of the bundle '{bundle}' could not be created: {e}")
+            sys.exit(1)
+    # only the forms of the batch are compared, not stale forms left in 'lics'
+    form_names: List[str] = []
+    failures: int = build_entries(objConsts, entries, family_registry, templates, approximate_version, build_manifest, args.engine, args.jobs, args.force, args.compression, bundle, args.taxonomies_list, args.previous_list, args.profile, approval_store, args.include_approved, args.queue_size, form_names)
+    if failures:
+        print(colored(f"\n{failures} of {entry_count} documents could not be generated!", 'red'))
+    rss_exceeded: bool = bool(args.max_rss) and report_peak_rss(args.max_rss, args.jobs > 1)
+    if args.diff:
+        with instrumentation.stage("diff"):
+            report_form_diff(objConsts, args.diff, bundle or "lics", form_names)
+    write_metrics(args.metrics)
+
+    if args.watch:
+        watch_entries(objConsts, entries, template_catalog, family_registry, approximate_version, build_manifest, args, approval_store)
+    # a batch with failed documents or too much memory fails like a check with errors
+    if failures or rss_exceeded:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()